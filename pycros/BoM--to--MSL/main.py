@@ -646,9 +646,10 @@ class BoMToMSLProcessor:
                 cell.alignment = _clone_alignment(cell.alignment, wrap_text=False, shrink_to_fit=True)
 
         # Row height and vertical alignment
+        last_col = ws.max_column or 0
         for row_idx in range(2, last_row + 1):
             ws.row_dimensions[row_idx].height = 18
-            for col in range(1, ws.max_column + 1):
+            for col in range(1, last_col + 1):
                 cell = ws.cell(row=row_idx, column=col)
                 cell.alignment = _clone_alignment(cell.alignment, vertical="center")
 
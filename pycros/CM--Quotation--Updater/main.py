@@ -484,18 +484,29 @@ def _copy_cells(
     max_row: int,
 ):
     column_offset = target_start - source_start
-
-    for row_number in range(1, max_row + 1):
-        for source_column in range(source_start, source_end + 1):
-            source_cell = source_ws.cell(row=row_number, column=source_column)
+    # The two sheets live in different workbooks, so style ids can't be shared
+    # directly; translate each distinct source style once and reuse the result.
+    style_cache = {}
+
+    for row_number, source_row in enumerate(
+        source_ws.iter_rows(
+            min_row=1,
+            max_row=max_row,
+            min_col=source_start,
+            max_col=source_end,
+        ),
+        start=1,
+    ):
+        for source_cell in source_row:
             if isinstance(source_cell, MergedCell):
                 continue
 
-            target_column = source_column + column_offset
+            target_column = source_cell.column + column_offset
             target_cell = target_ws.cell(row=row_number, column=target_column)
 
             value = source_cell.value
-            if source_cell.data_type == "f" and isinstance(value, str):
+            data_type = source_cell.data_type
+            if data_type == "f" and isinstance(value, str):
                 try:
                     value = Translator(
                         value,
@@ -505,9 +516,15 @@ def _copy_cells(
                     pass
 
             target_cell.value = value
-            target_cell.data_type = source_cell.data_type
+            target_cell.data_type = data_type
             if source_cell.has_style:
-                _copy_style(source_cell, target_cell)
+                style_key = tuple(source_cell._style)
+                cached_style = style_cache.get(style_key)
+                if cached_style is None:
+                    _copy_style(source_cell, target_cell)
+                    style_cache[style_key] = copy(target_cell._style)
+                else:
+                    target_cell._style = copy(cached_style)
             if source_cell.hyperlink:
                 target_cell._hyperlink = copy(source_cell.hyperlink)
             if source_cell.comment:
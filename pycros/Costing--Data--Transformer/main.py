@@ -328,12 +328,15 @@ def _load_pid103_sheet(ws: Worksheet, log: Callable[[str], None]) -> Dict[str, A
 
     # First pass: find both Style and TOTAL columns anywhere in first 50 rows
     # Search up to column 30 (AD) minimum, or max_column if larger
-    max_search_col = max(30, ws.max_column + 1)
-    log(f"    Sheet dimensions: max_row={ws.max_row}, max_column={ws.max_column}")
+    # max_row/max_column walk every stored cell, so read them once up front
+    max_row = ws.max_row
+    max_column = ws.max_column
+    max_search_col = max(30, max_column + 1)
+    log(f"    Sheet dimensions: max_row={max_row}, max_column={max_column}")
     log(f"    Searching rows 1-50, columns 1-{max_search_col-1}")
 
     # Debug: show first 5 rows structure
-    for debug_row in range(1, min(6, ws.max_row + 1)):
+    for debug_row in range(1, min(6, max_row + 1)):
         cells_preview = []
         for debug_col in range(1, min(25, max_search_col)):
             val = ws.cell(row=debug_row, column=debug_col).value
@@ -343,7 +346,7 @@ def _load_pid103_sheet(ws: Worksheet, log: Callable[[str], None]) -> Dict[str, A
             log(f"    Row {debug_row}: {', '.join(cells_preview[:8])}...")
 
     # First pass: find Style column
-    for row_idx in range(1, min(51, ws.max_row + 1)):
+    for row_idx in range(1, min(51, max_row + 1)):
         for col_idx in range(1, max_search_col):
             cell = ws.cell(row=row_idx, column=col_idx)
             val = _norm(cell.value).lower()
@@ -358,7 +361,7 @@ def _load_pid103_sheet(ws: Worksheet, log: Callable[[str], None]) -> Dict[str, A
             break
 
     # Second pass: find TOTAL column anywhere in first 10 rows (may be in different row than Style)
-    for row_idx in range(1, min(11, ws.max_row + 1)):
+    for row_idx in range(1, min(11, max_row + 1)):
         for col_idx in range(1, max_search_col):
             cell = ws.cell(row=row_idx, column=col_idx)
             val = _norm(cell.value).lower()
@@ -403,16 +406,16 @@ def _load_pid103_sheet(ws: Worksheet, log: Callable[[str], None]) -> Dict[str, A
 
     # Load data rows
     count = 0
-    rows_to_load = ws.max_row - header_row
-    log(f"    Loading data from row {header_row + 1} to {ws.max_row} ({rows_to_load} potential rows)")
+    rows_to_load = max_row - header_row
+    log(f"    Loading data from row {header_row + 1} to {max_row} ({rows_to_load} potential rows)")
 
     # Debug: show first 5 data rows
-    for debug_row in range(header_row + 1, min(header_row + 6, ws.max_row + 1)):
+    for debug_row in range(header_row + 1, min(header_row + 6, max_row + 1)):
         style_sample = ws.cell(row=debug_row, column=style_col).value
         total_sample = ws.cell(row=debug_row, column=total_col).value
         log(f"    Sample row {debug_row}: Style='{style_sample}', TOTAL='{total_sample}'")
 
-    for row_idx in range(header_row + 1, ws.max_row + 1):
+    for row_idx in range(header_row + 1, max_row + 1):
         style_val = _norm(ws.cell(row=row_idx, column=style_col).value)
         total_val = ws.cell(row=row_idx, column=total_col).value
 
@@ -610,22 +613,31 @@ def _delete_gain_rows(
 
 
 def _delete_rows(ws: Worksheet, row_indices: list[int]) -> None:
-    """Delete rows using grouped ranges to reduce shifting overhead."""
+    """Delete rows in one pass, moving each surviving cell up once."""
     if not row_indices:
         return
-    rows = sorted({int(r) for r in row_indices if r and int(r) > 0}, reverse=True)
+    rows = sorted({int(r) for r in row_indices if r and int(r) > 0})
     if not rows:
         return
 
-    group_start = rows[0]
-    group_end = rows[0]
-    for r in rows[1:]:
-        if r == group_end - 1:
-            group_end = r
+    cells = getattr(ws, "_cells", None)
+    if not isinstance(cells, dict):
+        for r in reversed(rows):
+            ws.delete_rows(r)
+        return
+
+    kept = {}
+    deleted_above = 0
+    for row, col in sorted(cells):
+        while deleted_above < len(rows) and rows[deleted_above] < row:
+            deleted_above += 1
+        if deleted_above < len(rows) and rows[deleted_above] == row:
             continue
-        ws.delete_rows(group_end, amount=(group_start - group_end + 1))
-        group_start = group_end = r
-    ws.delete_rows(group_end, amount=(group_start - group_end + 1))
+        cell = cells[row, col]
+        cell.row = row - deleted_above
+        kept[cell.row, col] = cell
+    ws._cells = kept
+    ws._current_row = ws.max_row if kept else 0
 
 
 def _insert_new_columns(
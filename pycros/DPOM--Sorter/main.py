@@ -1,8 +1,15 @@
+import csv
+import math
 import os
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, date, timedelta
-from typing import List, Tuple, Any, Optional, Dict
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
+from typing import List, Tuple, Any, Optional, Dict, Iterable, Sequence
 from collections import defaultdict, OrderedDict
+from copy import copy
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import (
     QFileDialog,
@@ -14,14 +21,22 @@ from PySide6.QtWidgets import (
 )
 from qfluentwidgets import PrimaryPushButton, MessageBox
 from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Alignment, Border, Side, PatternFill, Font
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Side, PatternFill, Font, NamedStyle
+from openpyxl.styles.fonts import DEFAULT_FONT
 from openpyxl.utils import get_column_letter
 
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv  # multithreaded CSV parser
+except Exception:
+    pa = None
+    pa_csv = None
+
 # =============================================================================
 # CONSTANTS & COLOR DEFINITIONS
 # =============================================================================
 # Excel Colors matching VBA constants
-COLOR_WHITE = "FFFFFF"
 COLOR_BLACK = "FF000000"
 COLOR_CYAN = "00FFFF"
 COLOR_PINK = "FFEBC8C3"  # cPink = 12830955
@@ -30,8 +45,40 @@ COLOR_GREEN = "FFA5EB7D"  # cGreen = 8252325
 COLOR_DARK_GREEN = "FF00B050"  # cDGreen = 5287936
 COLOR_MAGENTA = "800080"  # cDMagenta = 8388736
 
+# Output row type -> fill colour key (see ProcessingLogic._fills); rows not listed stay unfilled
+ROW_TYPE_FILLS = {
+    'TOTAL_PO': 'yellow',
+    'MONEY_PO': 'yellow',
+    'TOTAL_OGAC': 'pink',
+    'TOTAL_STYLE': 'green',
+    'MONEY_STYLE': 'green',
+    'SEP_BLACK': 'black',
+    'SEP_PINK': 'pink',
+    'SEP_DARK_GREEN': 'dark_green',
+}
+
+# Fixed text of the label column per quantity row type (money rows carry their own label)
+ROW_TYPE_LABELS = {
+    'ITEM': "Total Item Qty",
+    'TOTAL_PO': "Total PO Qty",
+    'TOTAL_OGAC': "Total OGAC Qty",
+    'TOTAL_STYLE': "Total Style Qty",
+}
+
+# Row type groups used by the output writer
+TOTAL_ROW_TYPES = frozenset({'TOTAL_PO', 'TOTAL_OGAC', 'TOTAL_STYLE'})
+MONEY_ROW_TYPES = frozenset({'MONEY_PO', 'MONEY_STYLE'})
+QTY_ROW_TYPES = TOTAL_ROW_TYPES | {'ITEM'}
+
 # Destination countries that require separating each Material (incl. colorway)
-SPLIT_MATERIAL_BY_DEST_COUNTRY = {"INDONESIA", "MEXICO", "CANADA"}
+SPLIT_MATERIAL_BY_DEST_COUNTRY = frozenset({"INDONESIA", "MEXICO", "CANADA"})
+
+# Maximum number of lines kept in the log box
+LOG_MAX_LINES = 5000
+
+# Upper bound on DPOM files processed at once; past a few, concurrent
+# workbook parsing/saving mostly contends for the GIL and the disk
+MAX_FILE_WORKERS = 4
 
 # Column indices in raw data (0-based)
 COL_VENDOR = 0
@@ -62,21 +109,35 @@ COL_SIZE_QTY = 24
 COL_TOTAL_QTY = 25
 COL_FOB = 26
 
+# Only the first 27 columns are used by the VBA logic; anything to the right is ignored.
+# The per-size columns must stay last: _pivot_data groups rows on the prefix before them.
+DPOM_COLUMN_COUNT = COL_FOB + 1
+
+# Columns coerced to numbers when reading CSV; the rest stay text (IDs keep leading zeros)
+CSV_NUMERIC_COLUMNS = frozenset({COL_YEAR, COL_SIZE_QTY, COL_TOTAL_QTY, COL_FOB})
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
+# Size spellings to collapse, from most specific to least
+SIZE_REPLACEMENTS = (
+    ("XXXXXL", "6XL"), ("XXXXL", "5XL"), ("XXXL", "3XL"), ("XXL", "2XL"),
+    ("XXXXXS", "6XS"), ("XXXXS", "5XS"), ("XXXS", "4XS"), ("XXS", "2XS"),
+)
+
+
 def normalize_size(size_val: Any) -> str:
     """Standardizes size strings for sorting/comparison - matches VBA NormalizeSize"""
     if size_val is None:
         return ""
-    s = str(size_val).strip().upper().replace("-", "")
-
-    # Replace from most specific to least
-    replacements = [
-        ("XXXXXL", "6XL"), ("XXXXL", "5XL"), ("XXXL", "3XL"), ("XXL", "2XL"),
-        ("XXXXXS", "6XS"), ("XXXXS", "5XS"), ("XXXS", "4XS"), ("XXXS", "3XS"), ("XXS", "2XS")
-    ]
-    for old, new in replacements:
+    return _normalize_size_str(str(size_val))
+
+
+@lru_cache(maxsize=8192)
+def _normalize_size_str(size_str: str) -> str:
+    # Only a handful of distinct sizes exist, so the replace chain runs once per spelling
+    s = size_str.strip().upper().replace("-", "")
+    for old, new in SIZE_REPLACEMENTS:
         s = s.replace(old, new)
     return s
 
@@ -86,18 +147,25 @@ def format_date_val(val) -> str:
     if isinstance(val, (datetime, date)):
         return val.strftime("%m/%d/%Y")
     if val and isinstance(val, str):
-        try:
-            # Try parsing DD/MM/YYYY format from input
-            if "/" in val:
-                parts = val.split("/")
-                if len(parts) == 3:
-                    dt = datetime(int(parts[2]), int(parts[1]), int(parts[0]))
-                    return dt.strftime("%m/%d/%Y")
-        except:
-            pass
+        return _format_date_str(val)
     return str(val) if val else ""
 
 
+@lru_cache(maxsize=4096)
+def _format_date_str(val: str) -> str:
+    # A file only carries a few hundred distinct dates, so each string converts once
+    try:
+        # Try parsing DD/MM/YYYY format from input
+        if "/" in val:
+            parts = val.split("/")
+            if len(parts) == 3:
+                dt = datetime(int(parts[2]), int(parts[1]), int(parts[0]))
+                return dt.strftime("%m/%d/%Y")
+    except:
+        pass
+    return val
+
+
 def parse_ogac_date(val) -> Optional[datetime]:
     """Parse OGAC date from Excel dates or DD/MM/YYYY strings."""
     if not val:
@@ -106,9 +174,14 @@ def parse_ogac_date(val) -> Optional[datetime]:
         return val
     if isinstance(val, date):
         return datetime(val.year, val.month, val.day)
+    return _parse_ogac_str(str(val))
+
+
+@lru_cache(maxsize=4096)
+def _parse_ogac_str(val: str) -> Optional[datetime]:
     try:
-        if "/" in str(val):
-            parts = str(val).split("/")
+        if "/" in val:
+            parts = val.split("/")
             if len(parts) == 3:
                 # VBA treats parts[0] as month and parts[1] as day
                 # even though input is DD/MM/YYYY
@@ -124,6 +197,22 @@ def parse_ogac_date(val) -> Optional[datetime]:
     return None
 
 
+@lru_cache(maxsize=256)
+def season_rank_value(season: Any) -> int:
+    """Planning season sort rank (FA, HO, SP, SU); a file only has a handful of distinct seasons"""
+    seas = str(season).upper()
+    if "FA" in seas:
+        return 1
+    if "HO" in seas:
+        return 2
+    if "SP" in seas:
+        return 3
+    if "SU" in seas:
+        return 4
+    return 9
+
+
+@lru_cache(maxsize=4096, typed=True)
 def normalize_country(val: Any) -> str:
     """Normalize destination country for comparisons"""
     if val is None:
@@ -131,6 +220,7 @@ def normalize_country(val: Any) -> str:
     return str(val).strip().upper()
 
 
+@lru_cache(maxsize=4096, typed=True)
 def format_afs_category(val: Any, width: int = 5) -> str:
     """Format AFS Category for Excel output."""
     if val is None:
@@ -164,6 +254,7 @@ def format_afs_category(val: Any, width: int = 5) -> str:
     return str(val).strip()
 
 
+@lru_cache(maxsize=4096, typed=True)
 def format_material_value(style_val: Any, strip_colorway: bool) -> Any:
     if style_val is None:
         return ""
@@ -182,6 +273,7 @@ def format_material_value(style_val: Any, strip_colorway: bool) -> Any:
     return material
 
 
+@lru_cache(maxsize=4096, typed=True)
 def format_ship_to_customer_number(val: Any) -> str:
     """Format Ship To Customer Number; uses '#' when empty (matches Excel output)."""
     if val is None:
@@ -206,19 +298,117 @@ def format_ship_to_customer_number(val: Any) -> str:
         return s if s else "#"
 
 
-def ensure_unique_path(path: str) -> str:
-    """Return a non-existing path by appending ' (n)' before the extension if needed."""
-    if not os.path.exists(path):
+def ensure_unique_path(path: str, taken: Optional[set] = None) -> str:
+    """Return a non-existing path by appending ' (n)' before the extension if needed.
+
+    Paths in ``taken`` count as existing, so outputs reserved for files that
+    have not been written yet are not handed out twice.
+    """
+    def in_use(p: str) -> bool:
+        return os.path.exists(p) or (taken is not None and p in taken)
+
+    if not in_use(path):
         return path
     base, ext = os.path.splitext(path)
     n = 1
     while True:
         candidate = f"{base} ({n}){ext}"
-        if not os.path.exists(candidate):
+        if not in_use(candidate):
             return candidate
         n += 1
 
 
+def coerce_csv_value(val: Optional[str], numeric: bool) -> Any:
+    """Convert a raw CSV field: blanks become None, numeric columns become int/float.
+
+    CSV carries no types, so text columns (PO numbers, AFS codes, dates) are kept
+    as-is to preserve leading zeros and let the date helpers parse them.
+    """
+    if val is None:
+        return None
+    s = val.strip()
+    if not s:
+        return None
+    if not numeric:
+        return val
+    try:
+        return int(s)
+    except ValueError:
+        pass
+    try:
+        f = float(s)
+    except ValueError:
+        return val
+    return f if math.isfinite(f) else val
+
+
+def _read_csv_fields(path: str) -> Iterable[Sequence[Optional[str]]]:
+    """Yield the raw string fields of each CSV data row, preferring pyarrow when available."""
+    if pa_csv is not None:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            header = next(csv.reader(f), [])
+        if not header:
+            return []
+        names = [f"c{i}" for i in range(len(header))]
+        invalid_rows = []
+
+        def on_invalid_row(row):
+            invalid_rows.append(row)
+            return "skip"
+
+        table = pa_csv.read_csv(
+            path,
+            read_options=pa_csv.ReadOptions(
+                block_size=64 << 20, use_threads=True, skip_rows=1, column_names=names
+            ),
+            parse_options=pa_csv.ParseOptions(invalid_row_handler=on_invalid_row),
+            # Everything as text, with only empty fields as null, so both paths see the same values
+            convert_options=pa_csv.ConvertOptions(
+                column_types={name: pa.string() for name in names},
+                null_values=[""],
+                strings_can_be_null=True,
+                quoted_strings_can_be_null=True,
+            ),
+        )
+        # Ragged rows can't be represented in a table; let the stdlib reader pad them instead
+        if not invalid_rows:
+            return zip(*(column.to_pylist() for column in table.columns[:DPOM_COLUMN_COUNT]))
+
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        return list(reader)
+
+
+def read_csv_rows(path: str) -> List[list]:
+    """Read DPOM data rows (header excluded) from a CSV file."""
+    data_rows = []
+    for fields in _read_csv_fields(path):
+        row = [
+            coerce_csv_value(v, i in CSV_NUMERIC_COLUMNS)
+            for i, v in enumerate(fields[:DPOM_COLUMN_COUNT])
+        ]
+        if any(row):
+            if len(row) < DPOM_COLUMN_COUNT:
+                row.extend([None] * (DPOM_COLUMN_COUNT - len(row)))
+            data_rows.append(row)
+    return data_rows
+
+
+def rounded_fob_by_size(sizes: Dict[str, Any], fob_by_size: Dict[str, Any], default_fob: Any) -> Dict[str, float]:
+    """FOB per ordered size rounded to cents, as used by every money roll-up (unparseable -> 0.0)."""
+    out = {}
+    for sz, qty in sizes.items():
+        if not qty:
+            continue
+        fob_val = fob_by_size.get(sz, default_fob)
+        try:
+            out[sz] = round(float(fob_val) if fob_val not in (None, "") else 0.0, 2)
+        except Exception:
+            out[sz] = 0.0
+    return out
+
+
 def year_sort_value(val: Any) -> int:
     """Best-effort year parsing for sorting (handles numbers/strings like '2025'/'2025.0')."""
     if val in (None, ""):
@@ -246,15 +436,6 @@ def numeric_sort_value(val: Any) -> int:
         return int(float(s)) if s else 0
     except Exception:
         return 0
-    if isinstance(val, bool):
-        return 0
-    try:
-        if isinstance(val, (int, float)):
-            return int(val)
-        s = str(val).strip()
-        return int(float(s)) if s else 0
-    except Exception:
-        return 0
 
 
 # =============================================================================
@@ -265,107 +446,152 @@ class ProcessingLogic:
         self.log = log_signal
         self.blind_buy_map = {}  # Map full style code -> BBJ
         self.size_order = []     # List of normalized sizes in order
+        self.size_rank = {}      # Normalized size -> first position in size_order
+        self._refs_key = None    # (path, mtime, size) of the loaded reference file
+
+        # Output styles/headers are identical for every file; build them once
+        self._fills = {
+            'yellow': PatternFill("solid", fgColor=COLOR_YELLOW),
+            'pink': PatternFill("solid", fgColor=COLOR_PINK),
+            'green': PatternFill("solid", fgColor=COLOR_GREEN),
+            'dark_green': PatternFill("solid", fgColor=COLOR_DARK_GREEN),
+            'black': PatternFill("solid", fgColor=COLOR_BLACK),
+        }
+        self._font_bold = Font(bold=True)
+        self._thin_border = Border(
+            left=Side(style='thin', color='D9D9D9'),
+            right=Side(style='thin', color='D9D9D9'),
+            top=Side(style='thin', color='D9D9D9'),
+            bottom=Side(style='thin', color='D9D9D9')
+        )
+        # Output headers - matching VBA output exactly (size columns are appended per file)
+        self._base_headers = (
+            "Vendor", "Planning Season", "Year", "Material",
+            "Job Number", "Product Type", "VNFOB", "Destination", "Blind Buy Job #",
+            "Silhouette Description", "Global Category Core Focus Description",
+            "PO Number", "Trading Co PO Number", "PO Line Item Number",
+            "Document Date", "Estimate BusWeekDate", "OGAC Date",
+            "Purchase Group Code", "Purchase Group Name", "Plant",
+            "Buy Group", "Doc Type Description", "Mode",
+            "",  # Empty column 24 (used for labels in data)
+            "Ship To Customer Number",
+            "",  # Empty column 26
+            "Customer Name",
+            "Destination Country", "AFS Category", "Category Description",
+            "Sub Category Size Value"
+        )
 
     def load_references(self, file_path):
-        """Load Size order and Blind Buy mappings from reference Excel"""
-        self.log.emit(f"Loading reference file: {os.path.basename(file_path)}")
+        """Load Size order and Blind Buy mappings from reference Excel
+
+        Builds fresh tables and swaps them in at the end, so a re-run never
+        keeps entries from an earlier reference file and the processing
+        methods only ever see a complete, read-only set. Runs that reuse an
+        unchanged reference file keep the tables already loaded.
+        """
         try:
-            wb = load_workbook(file_path, data_only=True)
-
-            # Load Size Order
-            if "Size" in wb.sheetnames:
-                ws_size = wb["Size"]
-                for row in ws_size.iter_rows(min_row=2, max_col=1, values_only=True):
-                    if row[0]:
-                        self.size_order.append(normalize_size(row[0]))
-
-            # Load Blind Buy mappings
-            if "Blind Buy" in wb.sheetnames:
-                ws_bb = wb["Blind Buy"]
-                for row in ws_bb.iter_rows(min_row=2, max_col=2, values_only=True):
-                    if row[0]:
-                        sc = str(row[0]).strip().upper()
-                        bbj = str(row[1]).strip() if len(row) > 1 and row[1] else ""
-                        self.blind_buy_map[sc] = bbj
+            st = os.stat(file_path)
+            refs_key = (os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+        except OSError:
+            refs_key = None
+        if refs_key is not None and refs_key == self._refs_key:
+            self.log.emit(f"Reference file unchanged, reusing: {os.path.basename(file_path)}")
+            return
 
-            wb.close()
+        size_order = []
+        blind_buy_map = {}
+        self.log.emit(f"Loading reference file: {os.path.basename(file_path)}")
+        try:
+            # Forward-only scans, so stream the sheets instead of building the full cell model
+            wb = load_workbook(file_path, data_only=True, read_only=True)
+            try:
+                # Load Size Order
+                if "Size" in wb.sheetnames:
+                    ws_size = wb["Size"]
+                    # Don't trust the stored <dimension>; some exporters write it wrong
+                    ws_size.reset_dimensions()
+                    for row in ws_size.iter_rows(min_row=2, max_col=1, values_only=True):
+                        if row[0]:
+                            size_order.append(normalize_size(row[0]))
+
+                # Load Blind Buy mappings
+                if "Blind Buy" in wb.sheetnames:
+                    ws_bb = wb["Blind Buy"]
+                    ws_bb.reset_dimensions()
+                    for row in ws_bb.iter_rows(min_row=2, max_col=2, values_only=True):
+                        if row[0]:
+                            sc = str(row[0]).strip().upper()
+                            bbj = str(row[1]).strip() if len(row) > 1 and row[1] else ""
+                            blind_buy_map[sc] = bbj
+            finally:
+                wb.close()
+            self.size_order = size_order
+            size_rank = {}
+            for i, sz in enumerate(size_order):
+                size_rank.setdefault(sz, i)
+            self.size_rank = size_rank
+            self.blind_buy_map = blind_buy_map
+            self._refs_key = refs_key
             self.log.emit(f"  Loaded {len(self.size_order)} sizes and {len(self.blind_buy_map)} blind buy entries")
         except Exception as e:
             raise Exception(f"Error loading references: {str(e)}")
 
-    def process_dpom_file(self, input_path, output_path):
-        """Main processing function - replicates VBA SortRecord + FirstPass + SecondPass + AddNewColumn"""
-        self.log.emit(f"Processing: {os.path.basename(input_path)}")
+    def read_dpom_rows(self, input_path):
+        """Read the raw DPOM data rows (header excluded) from an Excel or CSV file"""
+        if input_path.lower().endswith(".csv"):
+            return read_csv_rows(input_path)
 
-        # Step 1: Load raw data
-        wb = load_workbook(input_path, data_only=True)
-        ws = wb.active
+        # Rows are only read forward once, so stream them instead of building the cell model
+        wb = load_workbook(input_path, data_only=True, read_only=True)
+        try:
+            ws = wb.active
+            ws.reset_dimensions()
+            rows = ws.iter_rows(max_col=DPOM_COLUMN_COUNT, values_only=True)
+            header = next(rows, None)
+            # Our own output starts with a PROCESSED marker; re-sorting it would produce garbage
+            if header and isinstance(header[0], str) and header[0].strip() == "PROCESSED":
+                raise ValueError("file is already a DPOM Sorter output")
+            # Rows are only read from here on, so the tuples are kept as they are
+            return [row for row in rows if any(row)]
+        finally:
+            wb.close()
 
-        headers = [str(cell.value).strip() if cell.value else "" for cell in ws[1]]
-        data_rows = []
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            if any(row):
-                data_rows.append(list(row))
+    def process_dpom_rows(self, data_rows, output_path):
+        """Main processing function - replicates VBA SortRecord + FirstPass + SecondPass + AddNewColumn
 
+        Takes the raw rows from read_dpom_rows; Excel and CSV inputs converge here.
+        """
         if not data_rows:
             self.log.emit("  Empty file, skipping.")
             return
 
-        # Step 2: Pivot data (group by all columns except size-specific ones)
+        # Step 1: Pivot data (group by all columns except size-specific ones)
         grouped_data = self._pivot_data(data_rows)
 
-        # Step 3: Get all unique sizes and sort them
-        all_sizes = set()
-        for info in grouped_data.values():
-            all_sizes.update(info['sizes'].keys())
-
-        sorted_sizes = sorted(list(all_sizes),
-                              key=lambda x: self.size_order.index(x) if x in self.size_order else 99999)
-
-        # Step 4: Create sorted pivoted rows
+        # Step 2: Create sorted pivoted rows, collecting the unique sizes in the same pass
+        # Sort keys live in a parallel list so the sort compares plain tuples.
+        # Sizes are collected as dict keys (first-seen order) rather than a set, so sizes
+        # missing from the reference list keep a stable order after the stable sort below.
+        all_sizes = {}
         pivoted_rows = []
-        for key, info in grouped_data.items():
+        sort_keys = []
+        # Blind-buy job per distinct style (None when not a blind buy); styles repeat across POs
+        blind_buy_map = self.blind_buy_map
+        bb_by_style = {}
+        for info in grouped_data.values():
             raw = info['raw']
+            all_sizes.update(info['sizes'])
 
-            # Parse OGAC date for sorting - replicate VBA's logic exactly
-            # VBA treats DD/MM/YYYY as MM/DD/YYYY, creating sort key YYYYMMDD
             ogac_dt = parse_ogac_date(raw[COL_OGAC])
-            if ogac_dt:
-                # VBA's sort key: takes first part as MM, second as DD
-                # Input 01/10/2025 (1 Oct) → treated as month=01, day=10 → sort key "20250110"
-                # Input 24/09/2025 (24 Sep) → treated as month=24, day=09 → sort key "20252409"
-                # We need to create the same wrong sort key for consistency
-                ogac_raw = str(raw[COL_OGAC])
-                if "/" in ogac_raw:
-                    parts = ogac_raw.split("/")
-                    if len(parts) == 3:
-                        mm = parts[0].zfill(2)  # First part treated as month
-                        dd = parts[1].zfill(2)  # Second part treated as day
-                        yy = parts[2]
-                        ogac_str = f"{yy}{mm}{dd}"  # Wrong sort key matching VBA
-                    else:
-                        ogac_str = "99999999"
-                else:
-                    ogac_str = "99999999"
-            else:
-                ogac_str = "99999999"
-
-            # Get season rank
-            seas = str(raw[COL_SEASON]).upper()
-            season_rank = 9
-            if "FA" in seas:
-                season_rank = 1
-            elif "HO" in seas:
-                season_rank = 2
-            elif "SP" in seas:
-                season_rank = 3
-            elif "SU" in seas:
-                season_rank = 4
+            season_rank = season_rank_value(raw[COL_SEASON])
 
             # Extract style components
             style_full = str(raw[COL_STYLE])
             style_head = style_full[:6] if len(style_full) >= 6 else style_full
             style_cw = style_full[-3:] if "-" in style_full else ""
+            if style_full not in bb_by_style:
+                bb_by_style[style_full] = blind_buy_map.get(style_full.strip().upper())
+            country = str(raw[COL_COUNTRY])
 
             obj = {
                 'raw': raw,
@@ -373,42 +599,47 @@ class ProcessingLogic:
                 'total_qty': info['total_qty'],
                 'fob': info['fob'],
                 'fob_by_size': info.get('fob_by_size', {}),
+                'fob_rounded': rounded_fob_by_size(info['sizes'], info.get('fob_by_size', {}), info['fob']),
                 'style_head': style_head,
                 'style_cw': style_cw,
                 'style_full': style_full,
+                'bb_job': bb_by_style[style_full],
                 'year': raw[COL_YEAR],
                 'season_rank': season_rank,
                 'ogac_dt': ogac_dt,
-                'ogac_str': ogac_str,
                 'po': str(raw[COL_PO]),
                 'po_line': str(raw[COL_PO_LINE]),
                 'po_line_sort': numeric_sort_value(raw[COL_PO_LINE]),
-                'country': str(raw[COL_COUNTRY]),
+                'country': country,
+                # Grouping compares destinations many times per item; normalise once here
+                'country_norm': normalize_country(country),
                 'ship_no': format_ship_to_customer_number(raw[COL_SHIP_NO]),
                 'afs': format_afs_category(raw[COL_AFS])
             }
             pivoted_rows.append(obj)
-
-        # Step 5: Sort records (Style + Year + Season + OGAC first)
-        pivoted_rows.sort(key=lambda x: (
-            x['style_head'],
-            year_sort_value(x.get('year')),
-            x['season_rank'],
-            x['ogac_dt'] or datetime.max,
-            x['po'],
-            x['style_cw'],
-            x.get('po_line_sort', 0),
-            x['country'],
-            x['ship_no']
-        ))
-
-        # Step 6: Build final output structure with correct grouping
+            sort_keys.append((
+                style_head,
+                year_sort_value(obj['year']),
+                season_rank,
+                ogac_dt or datetime.max,
+                obj['po'],
+                style_cw,
+                obj['po_line_sort'],
+                obj['country'],
+                obj['ship_no'],
+            ))
+
+        # Step 3: Sort the sizes and the records (Style + Year + Season + OGAC first)
+        sorted_sizes = sorted(all_sizes, key=lambda x: self.size_rank.get(x, 99999))
+        order = sorted(range(len(pivoted_rows)), key=sort_keys.__getitem__)
+        pivoted_rows = [pivoted_rows[i] for i in order]
+
+        # Step 4: Build final output structure with correct grouping
         final_rows = self._build_output_structure(pivoted_rows, sorted_sizes)
 
-        # Step 7: Write to Excel with formatting
-        self._write_excel_output(final_rows, sorted_sizes, output_path, data_rows)
+        # Step 5: Write to Excel with formatting
+        self._write_excel_output(final_rows, sorted_sizes, output_path)
 
-        wb.close()
         self.log.emit(f"  Completed: {os.path.basename(output_path)}")
 
     def _pivot_data(self, data_rows):
@@ -416,31 +647,29 @@ class ProcessingLogic:
         grouped = {}
 
         for row in data_rows:
-            # Create key from all columns except size-specific ones.
+            # Create key from all columns except size-specific ones; those are the
+            # trailing columns (size desc, size qty, total qty, FOB), so a prefix slice does.
             # NOTE: FOB can vary by size; it must NOT create a separate group.
-            key_list = list(row)
-            key_list[COL_SIZE_DESC] = None
-            key_list[COL_SIZE_QTY] = None
-            key_list[COL_TOTAL_QTY] = None
-            key_list[COL_FOB] = None
-            key = tuple(key_list)
-
-            if key not in grouped:
-                grouped[key] = {
+            key = tuple(row[:COL_SIZE_DESC])
+
+            info = grouped.get(key)
+            if info is None:
+                info = grouped[key] = {
                     'raw': row,
                     'sizes': {},
                     'fob_by_size': {},
                     'total_qty': 0,
                     'fob': row[COL_FOB]
                 }
+            sizes = info['sizes']
 
             sz = normalize_size(row[COL_SIZE_DESC])
             qty = row[COL_SIZE_QTY] if isinstance(row[COL_SIZE_QTY], (int, float)) else 0
 
-            prev_qty = grouped[key]['sizes'].get(sz, 0)
+            prev_qty = sizes.get(sz, 0)
             new_qty = prev_qty + qty
-            grouped[key]['sizes'][sz] = new_qty
-            grouped[key]['total_qty'] += qty
+            sizes[sz] = new_qty
+            info['total_qty'] += qty
 
             # Track FOB per size (weighted average if same size appears multiple times).
             if qty:
@@ -450,11 +679,12 @@ class ProcessingLogic:
                 except Exception:
                     fob = 0.0
 
-                prev_fob = grouped[key]['fob_by_size'].get(sz)
+                fob_by_size = info['fob_by_size']
+                prev_fob = fob_by_size.get(sz)
                 if prev_fob is None or prev_qty <= 0:
-                    grouped[key]['fob_by_size'][sz] = fob
+                    fob_by_size[sz] = fob
                 else:
-                    grouped[key]['fob_by_size'][sz] = ((prev_fob * prev_qty) + (fob * qty)) / new_qty
+                    fob_by_size[sz] = ((prev_fob * prev_qty) + (fob * qty)) / new_qty
 
         return grouped
 
@@ -462,44 +692,14 @@ class ProcessingLogic:
         """Build final output structure - each PO gets its own Total OGAC Qty (matching Total PO Qty)"""
         final_rows = []
 
-        # Group by Style.
-        style_groups = defaultdict(list)
-        style_keep_colorway = {}
-        for row in pivoted_rows:
-            keep_colorway = False
-            style_key = row['style_head']
-            style_groups[style_key].append(row)
-            style_keep_colorway[style_key] = style_keep_colorway.get(style_key, False) or keep_colorway
-
-        def style_group_sort_key(k: str) -> tuple:
-            """Preserve SortRecord ordering across style groups (esp. split materials)."""
-            items = style_groups.get(k, [])
-            if not items:
-                return ("", 0, 9, datetime.max, datetime.max, "", "", 0, "", "", k)
-
-            first = items[0]
-            ogac_vals = [i.get('ogac_dt') for i in items if isinstance(i.get('ogac_dt'), datetime)]
-            max_ogac = max(ogac_vals) if ogac_vals else datetime.max
-            return (
-                first.get('style_head', ""),
-                year_sort_value(first.get('year')),
-                first.get('season_rank', 9),
-                first.get('ogac_dt') or datetime.max,
-                max_ogac,
-                first.get('po', ""),
-                first.get('style_cw', ""),
-                first.get('po_line_sort', 0),
-                first.get('country', ""),
-                first.get('ship_no', ""),
-                k,
-            )
-
-        for style_key in sorted(style_groups.keys(), key=style_group_sort_key):
-            style_items = style_groups[style_key]
-            keep_colorway = style_keep_colorway.get(style_key, False)
+        # Group by Style. Rows arrive sorted with style_head as the leading key, so each
+        # style is one contiguous run and the runs are already in SortRecord order.
+        for _, style_run in groupby(pivoted_rows, key=itemgetter('style_head')):
+            style_items = list(style_run)
 
             # Accumulate style totals
             style_totals = defaultdict(int)
+            style_total_qty = 0
             style_fob_by_size = {}
 
             # Group by Planning Year + Planning Season + OGAC date within style.
@@ -525,6 +725,7 @@ class ProcessingLogic:
 
                 # Accumulate OGAC totals (across POs under this style+OGAC)
                 ogac_totals = defaultdict(int)
+                ogac_total_qty = 0
 
                 # Group by PO within OGAC (each PO is independent)
                 po_groups = defaultdict(list)
@@ -537,6 +738,7 @@ class ProcessingLogic:
                 blank_scope_fob_by_size = defaultdict(dict)
                 blank_scope_last_item = {}
                 blank_scope_styles = defaultdict(set)
+                blank_scope_style_items = defaultdict(list)
                 for item in ogac_items:
                     base_po_key = (item['country'], item['po'], item['afs'])
                     explicit_style_scope_key = (item['po'], item['afs'])
@@ -544,28 +746,15 @@ class ProcessingLogic:
                     if ship_to != "#":
                         styles_with_explicit_ship_to[explicit_style_scope_key].add(item['style_full'])
                         money_scope_key = (*base_po_key, ship_to)
-                        for sz, qty in item.get('sizes', {}).items():
-                            if not qty:
-                                continue
-                            fob_val = item.get('fob_by_size', {}).get(sz, item.get('fob', 0))
-                            try:
-                                fob_num = round(float(fob_val) if fob_val not in (None, "") else 0.0, 2)
-                            except Exception:
-                                fob_num = 0.0
-                            money_scope_sizes[money_scope_key][sz] += qty
+                        for sz, fob_num in item['fob_rounded'].items():
+                            money_scope_sizes[money_scope_key][sz] += item['sizes'][sz]
                             money_scope_fob_by_size[money_scope_key][sz] = fob_num
                     else:
                         styles_with_blank_ship_to[explicit_style_scope_key].add(item['style_full'])
                         blank_scope_styles[base_po_key].add(item['style_full'])
-                        for sz, qty in item.get('sizes', {}).items():
-                            if not qty:
-                                continue
-                            fob_val = item.get('fob_by_size', {}).get(sz, item.get('fob', 0))
-                            try:
-                                fob_num = round(float(fob_val) if fob_val not in (None, "") else 0.0, 2)
-                            except Exception:
-                                fob_num = 0.0
-                            blank_scope_sizes[base_po_key][sz] += qty
+                        blank_scope_style_items[(*base_po_key, item['style_full'])].append(item)
+                        for sz, fob_num in item['fob_rounded'].items():
+                            blank_scope_sizes[base_po_key][sz] += item['sizes'][sz]
                             blank_scope_fob_by_size[base_po_key][sz] = fob_num
                         blank_scope_last_item[base_po_key] = item
                 split_ship_to_idx = 0
@@ -589,7 +778,7 @@ class ProcessingLogic:
                         blank_group_style_sizes[base_po_key] = {}
                     else:
                         blank_group_scope_key = base_po_key
-                        country_norm = normalize_country(item['country'])
+                        country_norm = item['country_norm']
                         if country_norm == "JAPAN":
                             blank_group_scope_key = (*base_po_key, item['raw'][COL_PLANT])
                         elif country_norm in SPLIT_MATERIAL_BY_DEST_COUNTRY:
@@ -610,7 +799,7 @@ class ProcessingLogic:
                         po_group_meta[po_key] = {
                             'base_po_key': base_po_key,
                             'first_index': item_idx,
-                            'country': normalize_country(item['country']),
+                            'country': item['country_norm'],
                             'ship_to': ship_to,
                             'plant': item['raw'][COL_PLANT],
                         }
@@ -624,14 +813,10 @@ class ProcessingLogic:
 
                 po_group_entries_by_base = OrderedDict()
                 for po_key, po_items in po_group_entries:
-                    po_group_entries_by_base[po_group_meta[po_key]['base_po_key']] = po_group_entries_by_base.get(
-                        po_group_meta[po_key]['base_po_key'],
-                        []
-                    ) + [(po_key, po_items)]
+                    po_group_entries_by_base.setdefault(po_group_meta[po_key]['base_po_key'], []).append((po_key, po_items))
 
                 ordered_po_group_entries = []
                 for entries in po_group_entries_by_base.values():
-                    entries = list(entries)
                     japan_blank_positions = [
                         idx for idx, (po_key, _) in enumerate(entries)
                         if po_group_meta[po_key]['ship_to'] == "#" and po_group_meta[po_key]['country'] == "JAPAN"
@@ -652,13 +837,15 @@ class ProcessingLogic:
                     is_blind_buy = False
                     bb_job = ""
                     for item in po_items:
-                        if item['style_full'].upper() in self.blind_buy_map:
+                        bb_val = item['bb_job']
+                        if bb_val is not None:
                             is_blind_buy = True
-                            bb_job = self.blind_buy_map[item['style_full'].upper()]
+                            bb_job = bb_val
                             break
 
-                    # Accumulate PO totals
+                    # Accumulate PO totals (per size and overall in the same sweep)
                     po_totals = defaultdict(int)
+                    po_total_qty = 0
                     po_fob_by_size = {}
 
                     # Add individual item rows
@@ -669,18 +856,12 @@ class ProcessingLogic:
                             'label': 'Total Item Qty',
                             'sizes': item['sizes'],
                             'total_qty': item['total_qty'],
-                            'keep_colorway': keep_colorway,
                         })
 
-                        for sz, qty in item.get('sizes', {}).items():
-                            if not qty:
-                                continue
+                        for sz, fob_num in item['fob_rounded'].items():
+                            qty = item['sizes'][sz]
                             po_totals[sz] += qty
-                            try:
-                                fob_val = item.get('fob_by_size', {}).get(sz, item.get('fob', 0))
-                                fob_num = round(float(fob_val) if fob_val not in (None, "") else 0.0, 2)
-                            except Exception:
-                                fob_num = 0.0
+                            po_total_qty += qty
                             po_fob_by_size[sz] = fob_num
                             style_fob_by_size[sz] = fob_num
 
@@ -704,28 +885,19 @@ class ProcessingLogic:
                             po_data_item = blank_scope_last_item.get(blank_scope_key, po_data_item)
 
                     if ship_to == "#" and len({item['style_full'] for item in po_items}) == 1 and len(blank_scope_styles[blank_scope_key]) == 1:
-                        style_scope_items = [
-                            item for item in ogac_items
-                            if item['country'] == po_data_item['country']
-                            and item['po'] == po_data_item['po']
-                            and item['afs'] == po_data_item['afs']
-                            and item['ship_no'] == "#"
-                            and item['style_full'] == po_data_item['style_full']
-                        ]
+                        style_scope_items = blank_scope_style_items.get((
+                            po_data_item['country'],
+                            po_data_item['po'],
+                            po_data_item['afs'],
+                            po_data_item['style_full'],
+                        ), [])
                         scope_plants = {item['raw'][COL_PLANT] for item in style_scope_items}
                         if len(style_scope_items) > len(po_items) and len(scope_plants) > 1:
                             scope_totals = defaultdict(int)
                             scope_fob_by_size = {}
                             for scope_item in style_scope_items:
-                                for sz, qty in scope_item.get('sizes', {}).items():
-                                    if not qty:
-                                        continue
-                                    scope_totals[sz] += qty
-                                    fob_val = scope_item.get('fob_by_size', {}).get(sz, scope_item.get('fob', 0))
-                                    try:
-                                        fob_num = round(float(fob_val) if fob_val not in (None, "") else 0.0, 2)
-                                    except Exception:
-                                        fob_num = 0.0
+                                for sz, fob_num in scope_item['fob_rounded'].items():
+                                    scope_totals[sz] += scope_item['sizes'][sz]
                                     scope_fob_by_size[sz] = fob_num
                             po_data_item = style_scope_items[-1]
                             po_money = sum(qty * scope_fob_by_size.get(sz, 0) for sz, qty in scope_totals.items())
@@ -742,10 +914,9 @@ class ProcessingLogic:
                         'type': 'TOTAL_PO',
                         'data': po_data_item,
                         'sizes': po_totals,
-                        'total_qty': sum(po_totals.values()),
+                        'total_qty': po_total_qty,
                         'blind_buy': is_blind_buy,
                         'bb_job': bb_job,
-                        'keep_colorway': keep_colorway,
                     })
 
                     # Net Unit Price row (PO level)
@@ -757,7 +928,6 @@ class ProcessingLogic:
                         'fob_by_size': po_fob_by_size,
                         'sizes': po_totals,
                         'total_money': po_money,
-                        'keep_colorway': keep_colorway,
                     })
 
                     # Trading Co Net Unit Price row (PO level)
@@ -769,7 +939,6 @@ class ProcessingLogic:
                         'fob_by_size': po_fob_by_size,
                         'sizes': po_totals,
                         'total_money': po_money,
-                        'keep_colorway': keep_colorway,
                     })
 
                     # Black separator after PO money rows
@@ -779,14 +948,15 @@ class ProcessingLogic:
                     for sz, qty in po_totals.items():
                         ogac_totals[sz] += qty
                         style_totals[sz] += qty
+                    ogac_total_qty += po_total_qty
+                    style_total_qty += po_total_qty
 
                 # Total OGAC Qty row (per OGAC date)
                 final_rows.append({
                     'type': 'TOTAL_OGAC',
                     'data': ogac_items[-1],
                     'sizes': ogac_totals,
-                    'total_qty': sum(ogac_totals.values()),
-                    'keep_colorway': keep_colorway,
+                    'total_qty': ogac_total_qty,
                 })
 
                 # Pink separator after OGAC
@@ -801,8 +971,7 @@ class ProcessingLogic:
                 'type': 'TOTAL_STYLE',
                 'data': style_items[-1],
                 'sizes': style_totals,
-                'total_qty': sum(style_totals.values()),
-                'keep_colorway': keep_colorway,
+                'total_qty': style_total_qty,
             })
 
             # Net Unit Price row (Style level)
@@ -813,7 +982,6 @@ class ProcessingLogic:
                 'sizes': style_totals,
                 'fob_by_size': style_fob_by_size,
                 'total_money': round(style_money, 2),
-                'keep_colorway': keep_colorway,
             })
 
             # Trading Co Net Unit Price row (Style level)
@@ -824,7 +992,6 @@ class ProcessingLogic:
                 'sizes': style_totals,
                 'fob_by_size': style_fob_by_size,
                 'total_money': round(style_money, 2),
-                'keep_colorway': keep_colorway,
             })
 
             # Dark green separator after Style
@@ -832,81 +999,86 @@ class ProcessingLogic:
 
         return final_rows
 
-    def _write_excel_output(self, final_rows, sorted_sizes, output_path, raw_data):
-        """Write final output to Excel with proper formatting"""
-        wb = Workbook()
-        ws = wb.active
-
-        # Define fills
-        fill_white = PatternFill("solid", fgColor=COLOR_WHITE)
-        fill_yellow = PatternFill("solid", fgColor=COLOR_YELLOW)
-        fill_pink = PatternFill("solid", fgColor=COLOR_PINK)
-        fill_green = PatternFill("solid", fgColor=COLOR_GREEN)
-        fill_dark_green = PatternFill("solid", fgColor=COLOR_DARK_GREEN)
-        fill_black = PatternFill("solid", fgColor=COLOR_BLACK)
-
-        font_bold = Font(bold=True)
-        thin_border = Border(
-            left=Side(style='thin', color='D9D9D9'),
-            right=Side(style='thin', color='D9D9D9'),
-            top=Side(style='thin', color='D9D9D9'),
-            bottom=Side(style='thin', color='D9D9D9')
-        )
+    def _write_excel_output(self, final_rows, sorted_sizes, output_path):
+        """Write final output to Excel with proper formatting
 
-        # Row 1: PROCESSED marker
-        ws['A1'] = "PROCESSED"
+        Rows are produced strictly top to bottom, so the sheet is streamed
+        through a write-only workbook; styled cells are built as WriteOnlyCell.
+        """
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
 
-        # Build headers - matching VBA output exactly
-        out_headers = [
-            "Vendor", "Planning Season", "Year", "Material",
-            "Job Number", "Product Type", "VNFOB", "Destination", "Blind Buy Job #",
-            "Silhouette Description", "Global Category Core Focus Description",
-            "PO Number", "Trading Co PO Number", "PO Line Item Number",
-            "Document Date", "Estimate BusWeekDate", "OGAC Date",
-            "Purchase Group Code", "Purchase Group Name", "Plant",
-            "Buy Group", "Doc Type Description", "Mode",
-            "",  # Empty column 24 (used for labels in data)
-            "Ship To Customer Number",
-            "",  # Empty column 26
-            "Customer Name",
-            "Destination Country", "AFS Category", "Category Description",
-            "Sub Category Size Value"
-        ]
+        font_bold = self._font_bold
+        thin_border = self._thin_border
+
+        out_headers = list(self._base_headers)
         out_headers.extend(sorted_sizes)
         out_headers.append("TOTAL")
         out_headers.append("")  # Trailing empty column 46
+        ncols = len(out_headers)
+
+        # Total/money rows and separators each share one fill (+ bold) combination per colour;
+        # register each once as a named style and keep its resolved style array, so a cell
+        # takes a single array copy instead of a per-cell lookup through wb.named_styles.
+        named_styles = {}
+        row_styles = {}
+        for row_type, key in ROW_TYPE_FILLS.items():
+            is_sep = row_type.startswith('SEP')
+            name = f"dpom_{'sep' if is_sep else 'total'}_{key}"
+            if name not in named_styles:
+                named_styles[name] = NamedStyle(
+                    name=name,
+                    fill=self._fills[key],
+                    font=DEFAULT_FONT if is_sep else font_bold,
+                )
+                wb.add_named_style(named_styles[name])
+            row_styles[row_type] = named_styles[name].as_tuple()
+
+        def styled_cell(value, style=None, border=None):
+            cell = WriteOnlyCell(ws, value=value)
+            if style is not None:
+                # Copy: the TOTAL column sets its own border on top of the row style
+                cell._style = copy(style)
+            if border is not None:
+                cell.border = border
+            return cell
+
+        # Column widths must be set before the first row is streamed
+        for col in range(1, ncols + 1):
+            ws.column_dimensions[get_column_letter(col)].width = 12
+
+        # Row 1: PROCESSED marker
+        ws.append(["PROCESSED"])
 
         # Row 2: Overall Result header AND grand total
-        ws.cell(2, len(out_headers) - 1, "Overall Result")
+        # (VBA doesn't calculate grand total, so only the text is written)
+        ws.append([None] * (ncols - 2) + ["Overall Result"])
 
         # Row 3: Column headers
-        for c, h in enumerate(out_headers, 1):
-            ws.cell(3, c, h)
+        ws.append(out_headers)
 
-        # Row 2 only has "Overall Result" text, no grand total calculation
-        # (VBA doesn't calculate grand total)
+        # Grand totals over the "Total Item Qty" rows, accumulated while they are written
+        size_grand_totals = defaultdict(int)
+        grand_total_qty = 0
 
         # Write data rows starting at row 4
         curr_row = 4
         GIPT = 10  # Days to subtract for Estimate BusWeekDate
+        bus_date_strs = {}  # OGAC date -> Estimate BusWeekDate text; many rows share an OGAC
 
         for row_obj in final_rows:
             row_type = row_obj['type']
 
             # Handle separators
             if row_type.startswith('SEP'):
-                fill = fill_black
-                if row_type == 'SEP_PINK':
-                    fill = fill_pink
-                elif row_type == 'SEP_DARK_GREEN':
-                    fill = fill_dark_green
-
-                for c in range(1, len(out_headers) + 1):
-                    ws.cell(curr_row, c).fill = fill
+                sep_style = row_styles.get(row_type, row_styles['SEP_BLACK'])
                 ws.row_dimensions[curr_row].height = 5
+                ws.append([styled_cell(None, style=sep_style) for _ in range(ncols)])
                 curr_row += 1
                 continue
 
+            vals = [None] * ncols
+
             # Get data
             raw = row_obj['data']['raw']
 
@@ -915,12 +1087,12 @@ class ProcessingLogic:
             style_val = format_material_value(raw[COL_STYLE], strip_colorway)
 
             # Column 1-3: Vendor, Season, Year
-            ws.cell(curr_row, 1, raw[COL_VENDOR])
-            ws.cell(curr_row, 2, raw[COL_SEASON])
-            ws.cell(curr_row, 3, raw[COL_YEAR])
+            vals[0] = raw[COL_VENDOR]
+            vals[1] = raw[COL_SEASON]
+            vals[2] = raw[COL_YEAR]
 
             # Column 4: Material (Style)
-            ws.cell(curr_row, 4, style_val)
+            vals[3] = style_val
 
             # Column 5: Job Number (empty for now)
 
@@ -928,102 +1100,84 @@ class ProcessingLogic:
 
             # Column 7: VNFOB
             if style_val:
-                ws.cell(curr_row, 7, "N")
+                vals[6] = "N"
 
             # Column 8: Destination (empty)
 
             # Column 9: Blind Buy Job #
             if row_type == 'TOTAL_PO' and row_obj.get('blind_buy'):
-                ws.cell(curr_row, 9, row_obj.get('bb_job', ''))
+                vals[8] = row_obj.get('bb_job', '')
 
             # Column 10-11: Silhouette, Category
-            ws.cell(curr_row, 10, raw[COL_SILHOUETTE])
-            ws.cell(curr_row, 11, raw[COL_CATEGORY])
+            vals[9] = raw[COL_SILHOUETTE]
+            vals[10] = raw[COL_CATEGORY]
 
             # Column 12-14: PO Number, Trading Co PO, PO Line
-            ws.cell(curr_row, 12, raw[COL_PO])
+            vals[11] = raw[COL_PO]
             tpo = raw[COL_TRADING_PO]
             if not tpo and style_val:
                 tpo = "-"
-            ws.cell(curr_row, 13, tpo)
-            ws.cell(curr_row, 14, raw[COL_PO_LINE])
+            vals[12] = tpo
+            vals[13] = raw[COL_PO_LINE]
 
             # Column 15: Document Date
-            ws.cell(curr_row, 15, format_date_val(raw[COL_DOC_DATE]))
+            vals[14] = format_date_val(raw[COL_DOC_DATE])
 
             # Column 16: Estimate BusWeekDate (calculated from OGAC)
             ogac_dt = row_obj['data'].get('ogac_dt')
             if ogac_dt:
-                calc_dt = ogac_dt - timedelta(days=GIPT)
-                # Get previous Monday
-                bus_dt = calc_dt - timedelta(days=calc_dt.weekday())
-                ws.cell(curr_row, 16, bus_dt.strftime("%m/%d/%Y"))
+                bus_dt_str = bus_date_strs.get(ogac_dt)
+                if bus_dt_str is None:
+                    calc_dt = ogac_dt - timedelta(days=GIPT)
+                    # Get previous Monday
+                    bus_dt = calc_dt - timedelta(days=calc_dt.weekday())
+                    bus_dt_str = bus_date_strs[ogac_dt] = bus_dt.strftime("%m/%d/%Y")
+                vals[15] = bus_dt_str
 
             # Column 17: OGAC Date
             if raw[COL_OGAC]:
-                ws.cell(curr_row, 17, format_date_val(raw[COL_OGAC]))
+                vals[16] = format_date_val(raw[COL_OGAC])
 
             # Column 18-20: Purchase Group Code, Name, Plant
-            ws.cell(curr_row, 18, raw[COL_PUR_GROUP_CODE])
-            ws.cell(curr_row, 19, raw[COL_PUR_GROUP_NAME])
-            ws.cell(curr_row, 20, raw[COL_PLANT])
+            vals[17] = raw[COL_PUR_GROUP_CODE]
+            vals[18] = raw[COL_PUR_GROUP_NAME]
+            vals[19] = raw[COL_PLANT]
 
             # Column 21-23: Buy Group, Doc Type Desc, Mode
-            ws.cell(curr_row, 21, raw[COL_DOC_TYPE])
-            ws.cell(curr_row, 22, raw[COL_DOC_TYPE_DESC])
-            ws.cell(curr_row, 23, raw[COL_TRANS])
+            vals[20] = raw[COL_DOC_TYPE]
+            vals[21] = raw[COL_DOC_TYPE_DESC]
+            vals[22] = raw[COL_TRANS]
 
             # Column 24: Label column (Total Item Qty, Total PO Qty, etc.)
-            if row_type == 'ITEM':
-                ws.cell(curr_row, 24, "Total Item Qty")
-            elif row_type == 'TOTAL_PO':
-                ws.cell(curr_row, 24, "Total PO Qty")
-            elif row_type == 'TOTAL_OGAC':
-                ws.cell(curr_row, 24, "Total OGAC Qty")
-            elif row_type == 'TOTAL_STYLE':
-                ws.cell(curr_row, 24, "Total Style Qty")
-            elif row_type == 'MONEY_PO' or row_type == 'MONEY_STYLE':
+            label = ROW_TYPE_LABELS.get(row_type)
+            if label is not None:
+                vals[23] = label
+            elif row_type in MONEY_ROW_TYPES:
                 # Money rows show the label
-                ws.cell(curr_row, 24, row_obj.get('label', ''))
-
-            # Column 25: Ship To Customer Number
-            if row_type in ['TOTAL_PO', 'TOTAL_OGAC', 'TOTAL_STYLE']:
-                # Total rows: empty
-                ws.cell(curr_row, 25, "")
-            elif row_type == 'ITEM' or row_type == 'MONEY_PO' or row_type == 'MONEY_STYLE':
-                # Item and money rows: show customer number or "#"
-                ws.cell(curr_row, 25, format_ship_to_customer_number(raw[COL_SHIP_NO]))
-
-            # Column 26: Empty column
-
-            # Column 27: Customer Name
-            if row_type in ['TOTAL_PO', 'TOTAL_OGAC', 'TOTAL_STYLE']:
-                # Total rows: empty
-                ws.cell(curr_row, 27, "")
-            elif row_type == 'ITEM' or row_type == 'MONEY_PO' or row_type == 'MONEY_STYLE':
-                # Item and money rows: show customer name or "#"
-                cn = raw[COL_SHIP_NAME]
-                if not cn:
-                    cn = "#"
-                ws.cell(curr_row, 27, cn)
-
-            # Column 28-31: Country, AFS, Category Desc, Sub Category
-            if row_type in ['TOTAL_PO', 'TOTAL_OGAC', 'TOTAL_STYLE']:
-                # Total rows (except Item rows): All location/category fields empty
-                ws.cell(curr_row, 28, "")
-                ws.cell(curr_row, 29, "")
-                ws.cell(curr_row, 30, "")
-                ws.cell(curr_row, 31, "")
+                vals[23] = row_obj.get('label', '')
+
+            # Columns 25-31: Ship To Customer Number, (empty), Customer Name,
+            # Country, AFS, Category Desc, Sub Category
+            if row_type in TOTAL_ROW_TYPES:
+                # Total rows: customer and location/category fields empty
+                vals[24] = ""
+                vals[26] = ""
+                vals[27] = ""
+                vals[28] = ""
+                vals[29] = ""
+                vals[30] = ""
             else:
-                # Item and Money rows: Show full info
-                ws.cell(curr_row, 28, raw[COL_COUNTRY])
-                afs_val = format_afs_category(raw[COL_AFS])
-                ws.cell(curr_row, 29, afs_val)
-                ws.cell(curr_row, 30, raw[COL_CAT_DESC])
-                ws.cell(curr_row, 31, raw[COL_SUB_CAT])
-
-            # Size columns start at column 32
-            col_off = 32
+                # Item and money rows: customer number/name ("#" when blank, already
+                # stamped on the pivoted row) and full location/category info
+                vals[24] = row_obj['data']['ship_no']
+                vals[26] = raw[COL_SHIP_NAME] or "#"
+                vals[27] = raw[COL_COUNTRY]
+                vals[28] = format_afs_category(raw[COL_AFS])
+                vals[29] = raw[COL_CAT_DESC]
+                vals[30] = raw[COL_SUB_CAT]
+
+            # Size columns start at column 32 (index 31)
+            col_off = 31
             if row_type == 'MONEY_PO':
                 # For money rows at PO level: show FOB in each size column that had qty
                 fob_by_size = row_obj.get('fob_by_size', {}) or {}
@@ -1031,91 +1185,68 @@ class ProcessingLogic:
                 for i, sz in enumerate(sorted_sizes):
                     qty = row_obj.get('sizes', {}).get(sz, 0)
                     if qty > 0:
-                        ws.cell(curr_row, col_off + i, fob_by_size.get(sz, default_fob))
+                        vals[col_off + i] = fob_by_size.get(sz, default_fob)
             elif row_type == 'MONEY_STYLE':
                 fob_by_size = row_obj.get('fob_by_size', {}) or {}
                 for i, sz in enumerate(sorted_sizes):
                     qty = row_obj.get('sizes', {}).get(sz, 0)
                     if qty > 0 and sz in fob_by_size:
-                        ws.cell(curr_row, col_off + i, fob_by_size[sz])
-            elif row_type == 'ITEM':
-                # For item rows: show quantities from the item's sizes
-                sizes_dict = row_obj.get('sizes', {})
-                for i, sz in enumerate(sorted_sizes):
-                    val = sizes_dict.get(sz, 0)
-                    if val > 0:
-                        ws.cell(curr_row, col_off + i, val)
+                        vals[col_off + i] = fob_by_size[sz]
             else:
-                # For total rows: show quantities
+                # For item and total rows: show quantities
                 sizes_dict = row_obj.get('sizes', {})
+                is_item = row_type == 'ITEM'
+                if is_item:
+                    grand_total_qty += row_obj.get('total_qty', 0)
+                # sorted_sizes covers every size on every row, so one sweep fills the
+                # row and (for item rows) rolls it into the grand totals
                 for i, sz in enumerate(sorted_sizes):
                     val = sizes_dict.get(sz, 0)
+                    if is_item:
+                        size_grand_totals[sz] += val
                     if val > 0:
-                        ws.cell(curr_row, col_off + i, val)
+                        vals[col_off + i] = val
 
             # TOTAL column (column 45 - second-to-last)
-            total_col_idx = len(out_headers) - 1
-            if row_type in ['ITEM', 'TOTAL_PO', 'TOTAL_OGAC', 'TOTAL_STYLE']:
-                ws.cell(curr_row, total_col_idx, row_obj.get('total_qty', 0))
+            total_col_idx = ncols - 1
+            if row_type in QTY_ROW_TYPES:
+                vals[total_col_idx - 1] = row_obj.get('total_qty', 0)
             # Money values go in the trailing empty column (column 46)
-            elif row_type in ['MONEY_PO', 'MONEY_STYLE']:
-                ws.cell(curr_row, len(out_headers), row_obj.get('total_money', 0))
+            elif row_type in MONEY_ROW_TYPES:
+                vals[ncols - 1] = row_obj.get('total_money', 0)
 
             # Apply colors and borders
-            fill = None
-            if row_type in ['TOTAL_PO', 'MONEY_PO']:
-                fill = fill_yellow
-            elif row_type == 'TOTAL_OGAC':
-                fill = fill_pink
-            elif row_type in ['TOTAL_STYLE', 'MONEY_STYLE']:
-                fill = fill_green
-
-            if fill:
-                for c in range(1, len(out_headers) + 1):
-                    cell = ws.cell(curr_row, c)
-                    cell.fill = fill
-                    cell.font = font_bold
-
-            # Add border to TOTAL column
-            ws.cell(curr_row, total_col_idx).border = thin_border
+            row_style = row_styles.get(row_type)
 
+            if row_style is not None:
+                vals = [styled_cell(v, style=row_style) for v in vals]
+                vals[total_col_idx - 1].border = thin_border
+            else:
+                # Add border to TOTAL column
+                vals[total_col_idx - 1] = styled_cell(vals[total_col_idx - 1], border=thin_border)
+
+            ws.append(vals)
             curr_row += 1
 
         # Add final summary row (VBA line 401-527)
         # This row sums all "Total Item Qty" rows
-        final_row = curr_row
-        ws.cell(final_row, 1, "Overall Result")
-        ws.cell(final_row, 24, "Total Item Qty")
-
-        # Calculate grand totals for each size column
-        size_grand_totals = defaultdict(int)
-        grand_total_qty = 0
-        for row_obj in final_rows:
-            if row_obj['type'] == 'ITEM':
-                for sz in sorted_sizes:
-                    qty = row_obj.get('sizes', {}).get(sz, 0)
-                    size_grand_totals[sz] += qty
-                grand_total_qty += row_obj.get('total_qty', 0)
+        final_vals = [None] * ncols
+        final_vals[0] = "Overall Result"
+        final_vals[23] = "Total Item Qty"
 
         # Write size grand totals
-        col_off = 32
+        col_off = 31
         for i, sz in enumerate(sorted_sizes):
             val = size_grand_totals.get(sz, 0)
             if val > 0:
-                ws.cell(final_row, col_off + i, val)
+                final_vals[col_off + i] = val
 
         # Write total grand total
-        ws.cell(final_row, len(out_headers) - 1, grand_total_qty)
-
-        curr_row += 1
-
-        # Auto-fit columns
-        for col in range(1, len(out_headers) + 1):
-            ws.column_dimensions[get_column_letter(col)].width = 12
+        final_vals[ncols - 2] = grand_total_qty
+        ws.append(final_vals)
 
         # Save
         wb.save(output_path)
-        wb.close()
 
 
 # =============================================================================
@@ -1128,6 +1259,10 @@ class MainWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.setObjectName("dpom_sorter_widget")
+        self._ref_path = ""
+        self._input_paths = []
+        # Only one run at a time, even if a second click lands before the button is disabled
+        self._run_sem = threading.BoundedSemaphore(1)
         self._build_ui()
         self._connect_signals()
         self.logic = ProcessingLogic(self.log_message)
@@ -1154,6 +1289,8 @@ class MainWidget(QWidget):
 
         self.log_box = QTextEdit(self)
         self.log_box.setReadOnly(True)
+        # Qt drops the oldest lines once the cap is hit, keeping appends cheap on long runs
+        self.log_box.document().setMaximumBlockCount(LOG_MAX_LINES)
         self.log_box.setStyleSheet("background: #1f1f1f; color: #d0d0d0; border: 1px solid #3a3a3a; border-radius: 4px;")
 
         layout = QVBoxLayout(self)
@@ -1179,22 +1316,25 @@ class MainWidget(QWidget):
     def select_ref_file(self):
         path, _ = QFileDialog.getOpenFileName(self, "Select Reference Excel", "", "Excel Files (*.xlsx *.xlsm)")
         if path:
+            self._ref_path = path
             self.files_box2.setText(path)
             self.check_ready()
 
     def select_input_files(self):
         paths, _ = QFileDialog.getOpenFileNames(self, "Select DPOM Files", "", "Excel/CSV Files (*.xlsx *.csv)")
         if paths:
+            self._input_paths = list(paths)
             self.files_box.setText("\n".join(paths))
             self.check_ready()
 
     def check_ready(self):
-        if self.files_box2.toPlainText() and self.files_box.toPlainText():
-            self.run_btn.setEnabled(True)
+        self.run_btn.setEnabled(bool(self._ref_path) and bool(self._input_paths))
 
     def run_process(self):
-        ref_file = self.files_box2.toPlainText()
-        inputs = self.files_box.toPlainText().split('\n')
+        ref_file = self._ref_path
+        inputs = list(self._input_paths)
+        if not self._run_sem.acquire(blocking=False):
+            return
 
         self.run_btn.setEnabled(False)
         self.log_box.clear()
@@ -1205,17 +1345,42 @@ class MainWidget(QWidget):
                 self.logic.load_references(ref_file)
                 success_count = 0
                 run_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+                # Reserve every output name up front; the files are written concurrently
+                taken = set()
+                jobs = []
                 for inp in inputs:
-                    if not inp.strip():
-                        continue
-                    out = f"{os.path.splitext(inp)[0]}_processed_{run_timestamp}.xlsx"
-                    out = ensure_unique_path(out)
-                    self.logic.process_dpom_file(inp, out)
-                    success_count += 1
-                self.processing_done.emit(success_count, 0, f"Processing Complete!\n{success_count} file(s) processed successfully.")
+                    out = ensure_unique_path(f"{os.path.splitext(inp)[0]}_processed_{run_timestamp}.xlsx", taken)
+                    taken.add(out)
+                    jobs.append((inp, out))
+
+                def process_one(inp, out):
+                    self.log_message.emit(f"Processing: {os.path.basename(inp)}")
+                    self.logic.process_dpom_rows(self.logic.read_dpom_rows(inp), out)
+
+                # Files are independent and openpyxl spends much of its time in C parsing/zip code,
+                # so overlap them; the reference data is only read once loaded
+                fail_count = 0
+                with ThreadPoolExecutor(max_workers=min(MAX_FILE_WORKERS, os.cpu_count() or 1, len(jobs))) as ex:
+                    futures = {ex.submit(process_one, inp, out): inp for inp, out in jobs}
+                    for fut in as_completed(futures):
+                        try:
+                            fut.result()
+                            success_count += 1
+                        except Exception as e:
+                            fail_count += 1
+                            self.log_message.emit(f"  Error processing {os.path.basename(futures[fut])}: {str(e)}")
+
+                msg = f"Processing Complete!\n{success_count} file(s) processed successfully."
+                if fail_count:
+                    msg += f"\n{fail_count} file(s) failed."
+                result = (success_count, fail_count, msg)
             except Exception as e:
                 self.log_message.emit(f"Critical Error: {str(e)}")
-                self.processing_done.emit(0, 1, f"Failed: {str(e)}")
+                result = (0, 1, f"Failed: {str(e)}")
+            finally:
+                self._run_sem.release()
+            self.processing_done.emit(*result)
 
         threading.Thread(target=worker, daemon=True).start()
 
@@ -1,15 +1,17 @@
 import os
 import shutil
+import stat
 import subprocess
 import tempfile
 import threading
 import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from time import perf_counter
 from typing import List, Tuple, Any, Optional
 
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, QTimer, Signal
 from PySide6.QtWidgets import (
     QFileDialog,
     QHBoxLayout,
@@ -37,6 +39,11 @@ except Exception:
     CheckIconButton = None
 
 
+# Upper bound on workbooks duplicated at once; each holds a full styled
+# workbook in memory, and past a few they mostly contend for the GIL
+MAX_FILE_WORKERS = 4
+
+
 def _emit(log_emit, text: str):
     if callable(log_emit):
         try:
@@ -51,6 +58,23 @@ def _soffice_executable() -> Optional[str]:
     return shutil.which("soffice") or shutil.which("libreoffice")
 
 
+def _write_atomically(out_path: str, write) -> None:
+    """Call ``write(tmp_path)`` and move the result onto ``out_path`` only once it is complete.
+
+    A crash or error mid-write leaves no half-written workbook at ``out_path``.
+    """
+    tmp_path = out_path + ".tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 def convert_xls_to_xlsx_with_libreoffice(xls_path: str, out_dir: str, log_emit=None) -> str:
     """
     Convert .xls -> .xlsx using LibreOffice for higher fidelity.
@@ -233,7 +257,7 @@ def convert_xls_to_xlsx_trimmed(xls_path: str, out_path: str, log_emit=None) ->
                 pass
 
         save_started = perf_counter()
-        out_wb.save(out_path)
+        _write_atomically(out_path, out_wb.save)
         save_elapsed = perf_counter() - save_started
         _emit(log_emit, f"Saved converted .xlsx in {save_elapsed:.2f}s.")
     finally:
@@ -249,6 +273,14 @@ class MainWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.setObjectName("excel_duper_widget")
+        self._files: List[str] = []
+
+        # Log lines arrive per sheet; buffer them and hand Qt one block per tick
+        self._log_buf: List[str] = []
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(100)
+        self._log_flush_timer.timeout.connect(self._flush_log)
 
         self._build_ui()
         self._connect_signals()
@@ -384,16 +416,15 @@ class MainWidget(QWidget):
             "",
             "Excel Files (*.xlsx *.xlsm *.xltx *.xltm *.xls)",
         )
-        if files:
-            self.files_box.setPlainText("\n".join(files))
+        self._files = list(files or [])
+        if self._files:
+            self.files_box.setPlainText("\n".join(self._files))
         else:
             self.files_box.clear()
 
     def _selected_files(self) -> List[str]:
-        text = self.files_box.toPlainText().strip()
-        if not text:
-            return []
-        return [line for line in text.split("\n") if line.strip()]
+        # files_box is a read-only view of this list
+        return list(self._files)
 
     def run_process(self):
         files = self._selected_files()
@@ -407,6 +438,7 @@ class MainWidget(QWidget):
         elif self.preserve_xls_format_checkbox is not None:
             preserve_xls_format = bool(self.preserve_xls_format_checkbox.isChecked())
 
+        self._log_buf.clear()
         self.log_box.clear()
         self.log_message.emit(f"Process starts")
         self.run_btn.setEnabled(False)
@@ -427,13 +459,23 @@ class MainWidget(QWidget):
         threading.Thread(target=worker, daemon=True).start()
 
     def append_log(self, text: str):
-        self.log_box.append(text)
+        self._log_buf.append(text)
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+
+    def _flush_log(self):
+        self._log_flush_timer.stop()
+        if not self._log_buf:
+            return
+        self.log_box.append("\n".join(self._log_buf))
+        self._log_buf.clear()
         self.log_box.ensureCursorVisible()
 
     def on_processing_done(self, ok: int, fail: int, out_path: str):
         if out_path:
             self.log_message.emit(f"Output workbook saved to: {out_path}")
         self.log_message.emit(f"Completed: {ok} success, {fail} failed.")
+        self._flush_log()
         self.run_btn.setEnabled(True)
         self.select_btn.setEnabled(True)
         title = "Processing complete" if fail == 0 else "Processing finished with issues"
@@ -452,6 +494,175 @@ def get_widget():
 
 # Pycro Main Process
 
+def _has_zip_signature(path: str, size_bytes: int) -> bool:
+    """Cheap check that ``path`` can be an .xlsx-family (zip) container."""
+    # 22 bytes is the smallest possible zip (an empty end-of-central-directory record)
+    if size_bytes < 22:
+        return False
+    with open(path, "rb") as fh:
+        return fh.read(4) == b"PK\x03\x04"
+
+
+def _truncate_ws(ws, max_row: int, max_col: int) -> None:
+    """Drop everything past (max_row, max_col) from a sheet in place.
+
+    Only trailing empty rows/columns go, so no surviving cell has to move; this
+    skips delete_rows/delete_cols, which re-sort and shift the whole sheet.
+    """
+    ws._cells = {
+        key: cell for key, cell in ws._cells.items() if key[0] <= max_row and key[1] <= max_col
+    }
+    # Styled but empty rows past the data would otherwise still be written out
+    for row in [r for r in ws.row_dimensions if r > max_row]:
+        del ws.row_dimensions[row]
+    for cell_range in list(ws.merged_cells.ranges):
+        if cell_range.min_row > max_row or cell_range.min_col > max_col:
+            ws.merged_cells.remove(cell_range)
+
+
+def _duped_output_path(path: str, timestamp: str, taken: set) -> str:
+    """Build YYYYMMDD_HHMMSS_duped_<name> next to ``path`` (.xls outputs as .xlsx).
+
+    Avoids overwriting existing files; paths in ``taken`` count as existing,
+    so files from the same batch never share an output name.
+    """
+    base_dir = os.path.dirname(path) or os.getcwd()
+    stem, orig_ext = os.path.splitext(os.path.basename(path))
+    out_ext = ".xlsx" if orig_ext.lower() == ".xls" else orig_ext
+    out_name = f"{timestamp}_duped_{stem}{out_ext}"
+    out_path = os.path.join(base_dir, out_name)
+
+    if os.path.exists(out_path) or out_path in taken:
+        counter = 1
+        name, ext_out = os.path.splitext(out_name)
+        while True:
+            candidate = os.path.join(base_dir, f"{name} ({counter}){ext_out}")
+            if not os.path.exists(candidate) and candidate not in taken:
+                out_path = candidate
+                break
+            counter += 1
+    return out_path
+
+
+def _process_one_file(path: str, out_path: str, label: str, log_emit, preserve_xls_format: bool) -> None:
+    """Duplicate a single workbook to ``out_path``; raises on failure."""
+    # One stat call answers both "is it a file" and "how big"
+    try:
+        st = os.stat(path)
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        raise FileNotFoundError(f"File not found: {path}")
+
+    ext = os.path.splitext(path)[1].lower()
+
+    size_bytes = st.st_size
+    keep_vba = ext in (".xlsm", ".xltm", ".xlam")
+    log_emit(
+        f"{label} - Opening workbook (size={size_bytes} bytes, ext={ext}, keep_vba={keep_vba})..."
+    )
+
+    open_started = perf_counter()
+    if ext == ".xls":
+        if preserve_xls_format:
+            # Convert with LibreOffice and copy the result as-is for best formatting fidelity.
+            try:
+                with tempfile.TemporaryDirectory(prefix="pycro_xls_convert_") as tmp_dir:
+                    converted = convert_xls_to_xlsx_with_libreoffice(path, tmp_dir, log_emit=log_emit)
+                    _write_atomically(out_path, lambda tmp: shutil.copy2(converted, tmp))
+            except Exception as lo_exc:
+                log_emit(
+                    f"{label} - LibreOffice conversion failed; falling back to values-only conversion. ({lo_exc})"
+                )
+                convert_xls_to_xlsx_trimmed(path, out_path, log_emit=log_emit)
+        else:
+            convert_xls_to_xlsx_trimmed(path, out_path, log_emit=log_emit)
+        return
+
+    if not _has_zip_signature(path, size_bytes):
+        raise ValueError("Not a valid Excel workbook (file is not a zip container)")
+
+    with warnings.catch_warnings():
+        warnings.filterwarnings(
+            "ignore",
+            message="wmf image format is not supported so the image is being dropped",
+            category=UserWarning,
+            module="openpyxl.reader.drawings",
+        )
+        wb = load_workbook(path, data_only=False, keep_vba=keep_vba)
+    open_elapsed = perf_counter() - open_started
+    log_emit(
+        f"{label} - Workbook opened in {open_elapsed:.2f}s with {len(wb.worksheets)} sheet(s)."
+    )
+
+    # One log message per file instead of several per sheet; with files running
+    # concurrently this also keeps each file's sheet lines together
+    report: List[str] = []
+    sheet_total = len(wb.worksheets)
+    for sheet_idx, ws in enumerate(wb.worksheets, start=1):
+        report.append(f"{label} - Scanning sheet {sheet_idx}/{sheet_total}: {ws.title}")
+        max_used_row = 0
+        max_used_col = 0
+
+        # Scan existing cells only (avoid creating millions of empty cells).
+        cells = getattr(ws, "_cells", None)
+        if isinstance(cells, dict):
+            for (r, c), cell in cells.items():
+                if cell.value is not None:
+                    if r > max_used_row:
+                        max_used_row = r
+                    if c > max_used_col:
+                        max_used_col = c
+        else:
+            for row in ws.iter_rows():
+                for cell in row:
+                    if cell.value is not None:
+                        if cell.row > max_used_row:
+                            max_used_row = cell.row
+                        if cell.column > max_used_col:
+                            max_used_col = cell.column
+
+        # Ensure merged ranges containing a value are fully kept.
+        if ws.merged_cells.ranges and (max_used_row or max_used_col):
+            for cell_range in ws.merged_cells.ranges:
+                if isinstance(cells, dict):
+                    top_left = cells.get((cell_range.min_row, cell_range.min_col))
+                else:
+                    top_left = ws.cell(row=cell_range.min_row, column=cell_range.min_col)
+
+                if top_left is not None and top_left.value is not None:
+                    if cell_range.max_row > max_used_row:
+                        max_used_row = cell_range.max_row
+                    if cell_range.max_col > max_used_col:
+                        max_used_col = cell_range.max_col
+
+        # If the sheet is completely empty, leave it as-is.
+        if max_used_row == 0 and max_used_col == 0:
+            report.append(f"{label} - Sheet '{ws.title}' is empty, skipping trim.")
+            continue
+
+        # Remove trailing completely empty rows/columns.
+        if isinstance(cells, dict):
+            _truncate_ws(ws, max_used_row, max_used_col)
+        else:
+            # max_row/max_column re-walk every cell on each access, so read them once
+            sheet_max_row = ws.max_row
+            if sheet_max_row > max_used_row:
+                ws.delete_rows(max_used_row + 1, sheet_max_row - max_used_row)
+            sheet_max_col = ws.max_column
+            if sheet_max_col > max_used_col:
+                ws.delete_cols(max_used_col + 1, sheet_max_col - max_used_col)
+
+        report.append(
+            f"{label} - Sheet '{ws.title}' trimmed to max_row={max_used_row}, max_col={max_used_col}."
+        )
+
+    if report:
+        log_emit("\n".join(report))
+
+    _write_atomically(out_path, wb.save)
+
+
 def process_files(file_paths: List[str], log_emit, preserve_xls_format: bool = False) -> Tuple[str, int, int]:
     """
     Duplicate each selected workbook, trimming trailing empty rows/columns
@@ -478,153 +689,34 @@ def process_files(file_paths: List[str], log_emit, preserve_xls_format: bool = F
 
     log_emit("Process Begin...")
 
+    # Reserve every output name up front; the files are written concurrently
+    run_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    taken: set = set()
+    jobs = []
     for index, path in enumerate(file_paths, start=1):
-        label = f"({index}/{total}) {os.path.basename(path)}"
-        try:
-            if not os.path.isfile(path):
-                raise FileNotFoundError(f"File not found: {path}")
-
-            ext = os.path.splitext(path)[1].lower()
-
-            size_bytes = os.path.getsize(path)
-            keep_vba = ext in (".xlsm", ".xltm", ".xlam")
-            log_emit(
-                f"{label} - Opening workbook (size={size_bytes} bytes, ext={ext}, keep_vba={keep_vba})..."
-            )
-
-            open_started = datetime.now()
-            if ext == ".xls":
-                # Build output path: YYYYMMDD_HHMMSS_duped_originalfilename (but .xls outputs as .xlsx)
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                base_dir = os.path.dirname(path) or os.getcwd()
-                base_name = os.path.basename(path)
-                stem, _orig_ext = os.path.splitext(base_name)
-                out_name = f"{timestamp}_duped_{stem}.xlsx"
-                out_path = os.path.join(base_dir, out_name)
-
-                # Avoid accidental overwrite if a file with the same name already exists.
-                if os.path.exists(out_path):
-                    counter = 1
-                    name, ext_out = os.path.splitext(out_name)
-                    while True:
-                        candidate = os.path.join(base_dir, f"{name} ({counter}){ext_out}")
-                        if not os.path.exists(candidate):
-                            out_path = candidate
-                            break
-                        counter += 1
-
-                if preserve_xls_format:
-                    # Convert with LibreOffice and copy the result as-is for best formatting fidelity.
-                    try:
-                        with tempfile.TemporaryDirectory(prefix="pycro_xls_convert_") as tmp_dir:
-                            converted = convert_xls_to_xlsx_with_libreoffice(path, tmp_dir, log_emit=log_emit)
-                            shutil.copy2(converted, out_path)
-                    except Exception as lo_exc:
-                        log_emit(
-                            f"{label} - LibreOffice conversion failed; falling back to values-only conversion. ({lo_exc})"
-                        )
-                        convert_xls_to_xlsx_trimmed(path, out_path, log_emit=log_emit)
-                else:
-                    convert_xls_to_xlsx_trimmed(path, out_path, log_emit=log_emit)
-
-                success += 1
-                last_output_path = out_path
-                log_emit(f"{label} - Output workbook saved to: {out_path}")
+        out_path = _duped_output_path(path, run_timestamp, taken)
+        taken.add(out_path)
+        jobs.append((f"({index}/{total}) {os.path.basename(path)}", path, out_path))
+
+    # Files are independent; overlap them so LibreOffice conversions and
+    # openpyxl's C-level parsing/zip work on one file run alongside another
+    workers = max(1, min(MAX_FILE_WORKERS, os.cpu_count() or 1, len(jobs)))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = {
+            ex.submit(_process_one_file, path, out_path, label, log_emit, preserve_xls_format): (label, out_path)
+            for label, path, out_path in jobs
+        }
+        for fut in as_completed(futures):
+            label, out_path = futures[fut]
+            try:
+                fut.result()
+            except Exception as exc:
+                fail += 1
+                log_emit(f"{label} - Error: {exc}")
                 continue
-
-            with warnings.catch_warnings():
-                warnings.filterwarnings(
-                    "ignore",
-                    message="wmf image format is not supported so the image is being dropped",
-                    category=UserWarning,
-                    module="openpyxl.reader.drawings",
-                )
-                wb = load_workbook(path, data_only=False, keep_vba=keep_vba)
-            open_elapsed = (datetime.now() - open_started).total_seconds()
-            log_emit(
-                f"{label} - Workbook opened in {open_elapsed:.2f}s with {len(wb.worksheets)} sheet(s)."
-            )
-
-            sheet_total = len(wb.worksheets)
-            for sheet_idx, ws in enumerate(wb.worksheets, start=1):
-                log_emit(f"{label} - Scanning sheet {sheet_idx}/{sheet_total}: {ws.title}")
-                max_used_row = 0
-                max_used_col = 0
-
-                # Scan existing cells only (avoid creating millions of empty cells).
-                cells = getattr(ws, "_cells", None)
-                if isinstance(cells, dict):
-                    for (r, c), cell in cells.items():
-                        if cell.value is not None:
-                            if r > max_used_row:
-                                max_used_row = r
-                            if c > max_used_col:
-                                max_used_col = c
-                else:
-                    for row in ws.iter_rows():
-                        for cell in row:
-                            if cell.value is not None:
-                                if cell.row > max_used_row:
-                                    max_used_row = cell.row
-                                if cell.column > max_used_col:
-                                    max_used_col = cell.column
-
-                # Ensure merged ranges containing a value are fully kept.
-                if ws.merged_cells.ranges and (max_used_row or max_used_col):
-                    for cell_range in ws.merged_cells.ranges:
-                        if isinstance(cells, dict):
-                            top_left = cells.get((cell_range.min_row, cell_range.min_col))
-                        else:
-                            top_left = ws.cell(row=cell_range.min_row, column=cell_range.min_col)
-
-                        if top_left is not None and top_left.value is not None:
-                            if cell_range.max_row > max_used_row:
-                                max_used_row = cell_range.max_row
-                            if cell_range.max_col > max_used_col:
-                                max_used_col = cell_range.max_col
-
-                # If the sheet is completely empty, leave it as-is.
-                if max_used_row == 0 and max_used_col == 0:
-                    log_emit(f"{label} - Sheet '{ws.title}' is empty, skipping trim.")
-                    continue
-
-                # Remove trailing completely empty rows/columns.
-                if ws.max_row > max_used_row:
-                    ws.delete_rows(max_used_row + 1, ws.max_row - max_used_row)
-                if ws.max_column > max_used_col:
-                    ws.delete_cols(max_used_col + 1, ws.max_column - max_used_col)
-
-                log_emit(
-                    f"{label} - Sheet '{ws.title}' trimmed to max_row={max_used_row}, max_col={max_used_col}."
-                )
-
-            # Build output path: YYYYMMDD_HHMMSS_duped_originalfilename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            base_dir = os.path.dirname(path) or os.getcwd()
-            base_name = os.path.basename(path)
-            stem, orig_ext = os.path.splitext(base_name)
-            out_name = f"{timestamp}_duped_{stem}{orig_ext}"
-            out_path = os.path.join(base_dir, out_name)
-
-            # Avoid accidental overwrite if a file with the same name already exists.
-            if os.path.exists(out_path):
-                counter = 1
-                name, ext_out = os.path.splitext(out_name)
-                while True:
-                    candidate = os.path.join(base_dir, f"{name} ({counter}){ext_out}")
-                    if not os.path.exists(candidate):
-                        out_path = candidate
-                        break
-                    counter += 1
-
-            wb.save(out_path)
-
             success += 1
             last_output_path = out_path
             log_emit(f"{label} - Output workbook saved to: {out_path}")
-        except Exception as exc:
-            fail += 1
-            log_emit(f"{label} - Error: {exc}")
 
     log_emit("Process Completed")
 
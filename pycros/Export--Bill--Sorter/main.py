@@ -6,6 +6,7 @@ import types
 from copy import copy
 from dataclasses import dataclass, replace
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 from typing import Callable, Iterable, Optional
 
 from PySide6.QtCore import Qt, Signal
@@ -27,6 +28,16 @@ TC_GROUP_FILL_COLORS = ("FFFFFF00", "FFFCD5B4")
 DATE_DISPLAY_FORMAT = "d-mmm"
 AMOUNT_DISPLAY_FORMAT = "#,##0.00"
 PAYMENT_DAYS_DISPLAY_FORMAT = "0"
+DATE_PARSE_FORMATS = (
+    "%Y-%m-%d",
+    "%d/%m/%Y",
+    "%m/%d/%Y",
+    "%d-%b-%Y",
+    "%d-%b-%y",
+    "%d-%b",
+    "%d %b %Y",
+    "%d %b %y",
+)
 
 PDF_INVOICE_REF_RE = r"\d{2}[A-Z]\d{4,5}"
 PDF_MONEY_RE = r"\(?[\d,]+\.\d{2}\)?"
@@ -39,6 +50,15 @@ PDF_INVOICE_ROW_RE = re.compile(
 )
 PDF_FEE_ROW_RE = re.compile(r"^Invoice Fee\s+\((?P<amount>[\d,]+\.\d{2})\s+(?P<currency>[A-Z]{3})\)$")
 PDF_FEE_SECTION_RE = re.compile(r"Fees \(([A-Z]{3})\) \(([\d,]+\.\d{2}) ([A-Z]{3})\)")
+PDF_INVOICE_LINE_START_RE = re.compile(rf"^{PDF_INVOICE_REF_RE}\b")
+
+# Per-cell/per-row patterns, compiled once rather than looked up in re's cache on every call
+INT_DOT_ZERO_RE = re.compile(r"\d+\.0")
+MONEY_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+PAYMENT_TERM_SEP_RE = re.compile(r"[\s/]+")
+PAYMENT_REF_RE = re.compile(r"^Payment\s*-\s*(.+)$", re.IGNORECASE)
+LOCAL_EXPORT_INVOICE_RE = re.compile(r"^\d{2}M")
+SUM_I_RANGE_RE = re.compile(r"=SUM\(I(\d+):I(\d+)\)$", re.I)
 
 # Default 2026 MY public holidays (editable in UI). These are commonly used national holidays;
 # some Malaysia holidays are state-specific, so users can add/remove as needed.
@@ -116,7 +136,7 @@ def normalize_invoice(val) -> str:
     s = str(val).strip()
     if not s:
         return ""
-    if re.fullmatch(r"\d+\.0", s):
+    if INT_DOT_ZERO_RE.fullmatch(s):
         try:
             return str(int(float(s))).strip()
         except Exception:
@@ -145,7 +165,7 @@ def parse_money(val) -> Optional[float]:
         s = s[1:-1]
     s = s.replace("$", "").replace(",", "").strip()
     # Handle values like "24172.90 USD" by extracting the first number.
-    m = re.search(r"-?\d+(?:\.\d+)?", s)
+    m = MONEY_NUMBER_RE.search(s)
     if not m:
         return None
     try:
@@ -172,17 +192,13 @@ def parse_date_any(val, *, fallback_year: Optional[int] = None) -> Optional[date
     s = str(val).strip()
     if not s:
         return None
-    fmts = [
-        "%Y-%m-%d",
-        "%d/%m/%Y",
-        "%m/%d/%Y",
-        "%d-%b-%Y",
-        "%d-%b-%y",
-        "%d-%b",
-        "%d %b %Y",
-        "%d %b %y",
-    ]
-    for fmt in fmts:
+    return _parse_date_str(s, fallback_year)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_str(s: str, fallback_year: Optional[int]) -> Optional[date]:
+    # Date columns repeat the same few strings; each miss can cost up to 8 strptime attempts
+    for fmt in DATE_PARSE_FORMATS:
         try:
             dt = datetime.strptime(s, fmt)
             if fmt in ("%d-%b",) and fallback_year is not None:
@@ -251,13 +267,14 @@ def _find_cell_with_value(ws, needle: str, *, max_rows: int = 80, max_cols: int
     target = needle.strip().upper()
     mr = min(ws.max_row or 0, max_rows)
     mc = min(ws.max_column or 0, max_cols)
-    for r in range(1, mr + 1):
-        for c in range(1, mc + 1):
-            v = ws.cell(r, c).value
+    if mr < 1 or mc < 1:
+        return None
+    for r_idx, row in enumerate(ws.iter_rows(min_row=1, max_row=mr, max_col=mc, values_only=True), start=1):
+        for c_idx, v in enumerate(row, start=1):
             if v is None:
                 continue
             if str(v).strip().upper() == target:
-                return (r, c)
+                return (r_idx, c_idx)
     return None
 
 
@@ -279,21 +296,27 @@ def read_feac_ref_data(path: str, *, log_emit=None) -> tuple[dict[str, int], dic
                 _emit(log_emit, f"[FEAC] '{ws.title}': 'Ref. No.' not found (skipped).")
                 continue
             header_r, header_c = pos
+            # Read-only sheets re-parse from the top on every ws.cell(), so stream rows instead
+            header_vals = next(
+                ws.iter_rows(min_row=header_r, max_row=header_r, max_col=header_c, values_only=True), ()
+            )
             date_c = None
-            for c in range(1, header_c + 1):
-                v = ws.cell(header_r, c).value
+            for c, v in enumerate(header_vals, start=1):
                 if v is not None and str(v).strip().upper() == "DATE":
                     date_c = c
                     break
             blanks_in_a_row = 0
             started = False
             current_date = None
-            for r in range(header_r + 1, (ws.max_row or header_r) + 1):
+            max_row = ws.max_row or header_r
+            if max_row <= header_r:
+                continue
+            for row in ws.iter_rows(min_row=header_r + 1, max_row=max_row, max_col=header_c, values_only=True):
                 if date_c is not None:
-                    row_date = parse_date_any(ws.cell(r, date_c).value)
+                    row_date = parse_date_any(row[date_c - 1])
                     if row_date:
                         current_date = row_date
-                v = ws.cell(r, header_c).value
+                v = row[header_c - 1]
                 if v is None or str(v).strip() == "":
                     blanks_in_a_row += 1
                     if started and blanks_in_a_row >= 30:
@@ -356,6 +379,11 @@ def _snapshot_row(cells: Iterable, row_idx: int, ws) -> _RowSnap:
     return _RowSnap(origin_row=row_idx, cells=snaps, height=h)
 
 
+def _clear_rows(ws, first_row: int, last_row: int) -> None:
+    for key in [k for k in ws._cells if first_row <= k[0] <= last_row]:
+        del ws._cells[key]
+
+
 def _apply_row_snapshot(ws, dst_row: int, snap: _RowSnap) -> None:
     if snap.height is not None:
         ws.row_dimensions[dst_row].height = snap.height
@@ -363,8 +391,9 @@ def _apply_row_snapshot(ws, dst_row: int, snap: _RowSnap) -> None:
         dst = ws.cell(dst_row, col_idx)
         v = cs.value
         if isinstance(v, str) and v.startswith("="):
-            origin = f"{get_column_letter(col_idx)}{snap.origin_row}"
-            dest = f"{get_column_letter(col_idx)}{dst_row}"
+            col_letter = get_column_letter(col_idx)
+            origin = f"{col_letter}{snap.origin_row}"
+            dest = f"{col_letter}{dst_row}"
             try:
                 v = Translator(v, origin=origin).translate_formula(dest)
             except Exception:
@@ -549,11 +578,15 @@ def regroup_and_sort_export_bill_sheet(
         out_rows.append(("total", (unmatched_start, unmatched_end)))
         cursor += 1
 
-    # Rewrite region
+    # Rewrite region in place; only the size difference shifts the tail
     orig_count = end - start + 1
     new_count = len(out_rows)
-    ws.delete_rows(start, orig_count)
-    ws.insert_rows(start, new_count)
+    delta = new_count - orig_count
+    if delta > 0:
+        ws.insert_rows(end + 1, delta)
+    elif delta < 0:
+        ws.delete_rows(start + new_count, -delta)
+    _clear_rows(ws, start, start + new_count - 1)
 
     write_row = start
     for kind, payload in out_rows:
@@ -688,7 +721,7 @@ def read_vn_records(path: str, sheet_name: str, *, log_emit=None) -> list[Export
             rows_with_inv += 1
 
             term_val = _norm_str(row[payterm_i] if payterm_i < len(row) else None)
-            term_norm = re.sub(r"[\s/]+", "", term_val.strip().upper())
+            term_norm = PAYMENT_TERM_SEP_RE.sub("", term_val.strip().upper())
             if term_norm != "BYTC":
                 skipped_term += 1
                 continue
@@ -752,7 +785,7 @@ def read_local_records(path: str, sheet_name: str, *, log_emit=None) -> list[Exp
             rows_with_inv += 1
 
             term_val = _norm_str(row[term_i] if term_i < len(row) else None)
-            term_norm = re.sub(r"[\s/]+", "", term_val.strip().upper())
+            term_norm = PAYMENT_TERM_SEP_RE.sub("", term_val.strip().upper())
             if term_norm != "BYTC":
                 skipped_term += 1
                 continue
@@ -805,8 +838,10 @@ def scan_existing_invoices(wb) -> set[str]:
         if ws.title not in EXPORT_BILL_TARGET_SHEETS:
             continue
         max_row = ws.max_row or 0
-        for r in range(1, max_row + 1):
-            inv = normalize_invoice(ws.cell(r, 1).value)
+        if max_row < 1:
+            continue
+        for (v,) in ws.iter_rows(min_row=1, max_row=max_row, max_col=1, values_only=True):
+            inv = normalize_invoice(v)
             if not inv:
                 continue
             inv_u = inv.strip().upper()
@@ -955,8 +990,10 @@ def build_invoice_index(wb) -> dict[str, tuple[str, int]]:
         if ws.title not in EXPORT_BILL_TARGET_SHEETS:
             continue
         max_row = ws.max_row or 0
-        for r in range(1, max_row + 1):
-            inv = normalize_invoice(ws.cell(r, 1).value)
+        if max_row < 1:
+            continue
+        for r, (v,) in enumerate(ws.iter_rows(min_row=1, max_row=max_row, max_col=1, values_only=True), start=1):
+            inv = normalize_invoice(v)
             if not inv:
                 continue
             inv_u = inv.strip().upper()
@@ -971,14 +1008,14 @@ def find_value_right_of_label(ws, label: str) -> Optional[object]:
     target = label.strip().upper()
     max_row = ws.max_row or 0
     max_col = ws.max_column or 0
-    for r in range(1, max_row + 1):
-        for c in range(1, max_col + 1):
-            v = ws.cell(r, c).value
+    if max_row < 1 or max_col < 1:
+        return None
+    for row in ws.iter_rows(min_row=1, max_row=max_row, max_col=max_col, values_only=True):
+        for c_idx, v in enumerate(row):
             if v is None:
                 continue
             if str(v).strip().upper() == target:
-                for cc in range(c + 1, max_col + 1):
-                    vv = ws.cell(r, cc).value
+                for vv in row[c_idx + 1:]:
                     if vv is not None and str(vv).strip() != "":
                         return vv
                 return None
@@ -988,13 +1025,13 @@ def find_value_right_of_label(ws, label: str) -> Optional[object]:
 def find_payment_ref(ws) -> Optional[str]:
     max_row = ws.max_row or 0
     max_col = ws.max_column or 0
-    pat = re.compile(r"^Payment\s*-\s*(.+)$", re.IGNORECASE)
-    for r in range(1, max_row + 1):
-        for c in range(1, max_col + 1):
-            v = ws.cell(r, c).value
+    if max_row < 1 or max_col < 1:
+        return None
+    for row in ws.iter_rows(min_row=1, max_row=max_row, max_col=max_col, values_only=True):
+        for v in row:
             if v is None:
                 continue
-            m = pat.match(str(v).strip())
+            m = PAYMENT_REF_RE.match(str(v).strip())
             if m:
                 return m.group(1).strip()
     return None
@@ -1188,7 +1225,7 @@ def read_trade_card_pdf(path: str, *, log_emit=None) -> TradeCardData:
                         invoice_fee = abs(fee_amount)
                     continue
 
-                if in_invoice_lines and re.match(rf"^{PDF_INVOICE_REF_RE}\b", line):
+                if in_invoice_lines and PDF_INVOICE_LINE_START_RE.match(line):
                     suspicious.append(f"page {page_no}: {line}")
 
     full_text = "\n".join(page_texts)
@@ -1498,7 +1535,7 @@ class ProcessingLogic:
                         continue
 
                     inv_u = inv.strip().upper()
-                    dest_sheet = "NK Local Export" if re.match(r"^\d{2}M", inv_u) else trade_card.dest_sheet
+                    dest_sheet = "NK Local Export" if LOCAL_EXPORT_INVOICE_RE.match(inv_u) else trade_card.dest_sheet
                     if not dest_sheet or dest_sheet not in export_wb.sheetnames:
                         continue
 
@@ -1587,7 +1624,7 @@ class ProcessingLogic:
                     continue
                 for r in range(1, (ws.max_row or 0) + 1):
                     iv = ws.cell(r, 9).value
-                    mo = re.match(r"=SUM\(I(\d+):I(\d+)\)$", iv, re.I) if isinstance(iv, str) else None
+                    mo = SUM_I_RANGE_RE.match(iv) if isinstance(iv, str) else None
                     if mo and not any(
                         ws.cell(x, 9).value not in (None, "")
                         for x in range(int(mo.group(1)), int(mo.group(2)) + 1)
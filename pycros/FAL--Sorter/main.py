@@ -190,11 +190,12 @@ def _delete_columns(ws: Worksheet):
     """Delete columns R, O, J, I, H, G, E in correct order to avoid shifting issues"""
     letters = ['R', 'O', 'J', 'I', 'H', 'G', 'E']
     indices = []
+    max_col = ws.max_column or 0
 
     for col_letter in letters:
         try:
             idx = column_index_from_string(col_letter)
-            if idx <= (ws.max_column or 0):
+            if idx <= max_col:
                 indices.append(idx)
         except Exception:
             pass
@@ -612,10 +613,9 @@ def _load_xls_as_openpyxl_workbook(path: str):
     ws = wb.active
     ws.title = sh.name if sh.name else 'Sheet1'
 
+    # append() places a whole row at once instead of a lookup per cell
     for r in range(sh.nrows):
-        row = sh.row(r)
-        for c, cell in enumerate(row):
-            ws.cell(row=r + 1, column=c + 1, value=_xlrd_cell_value(book, cell))
+        ws.append([_xlrd_cell_value(book, cell) for cell in sh.row(r)])
 
     return wb
 
@@ -64,17 +64,26 @@ def normalize_header(header_text):
         return ""
     return str(header_text).replace("\n", " ").replace("\r", "").strip().upper()
 
+def build_header_index(headers) -> Dict[str, int]:
+    """Map each normalized header to the index of its first occurrence."""
+    index: Dict[str, int] = {}
+    for idx, h in enumerate(headers):
+        index.setdefault(normalize_header(h), idx)
+    return index
+
 def get_col_index(headers, target_names):
-    """Find index of a header that matches one of the target names."""
+    """Find index of a header that matches one of the target names.
+
+    `headers` is either the header row itself or a map from build_header_index;
+    pass the map when looking up many columns in the same row."""
     if isinstance(target_names, str):
         target_names = [target_names]
 
-    target_names = [normalize_header(t) for t in target_names]
+    if not isinstance(headers, dict):
+        headers = build_header_index(headers)
 
-    for idx, h in enumerate(headers):
-        if normalize_header(h) in target_names:
-            return idx
-    return -1
+    found = [headers[t] for t in (normalize_header(t) for t in target_names) if t in headers]
+    return min(found) if found else -1
 
 MONEY_ZERO = Decimal("0")
 MONEY_CENT = Decimal("0.01")
@@ -729,9 +738,9 @@ def load_xls_as_workbook(path: str, preferred_names: Optional[List[str]] = None)
     wb = Workbook()
     ws = wb.active
     ws.title = preferred_names[0] if preferred_names else "Sheet1"
-    for r_idx, row in enumerate(rows, start=1):
-        for c_idx, value in enumerate(row, start=1):
-            ws.cell(row=r_idx, column=c_idx, value=value)
+    # append() places a whole row at once instead of a lookup per cell
+    for row in rows:
+        ws.append(row)
     return wb
 
 def load_file_data(path, log_emit) -> Tuple[List[Any], List[List[Any]], Any]:
@@ -800,8 +809,9 @@ def _dedupe_column_specs(specs: List[ColumnSpec]) -> List[ColumnSpec]:
 def missing_required_columns(headers: List[Any], specs: List[ColumnSpec]) -> List[str]:
     """Return required display labels that are not present in headers."""
     missing = []
+    header_index = build_header_index(headers)
     for label, names in _dedupe_column_specs(specs):
-        if get_col_index(headers, names) == -1:
+        if get_col_index(header_index, names) == -1:
             missing.append(label)
     return missing
 
@@ -886,19 +896,20 @@ def process_logic(master_files, ppm_files, pps_files, log_emit, report_emit, deb
 
             header_row_idx = 0
             headers = [str(c) for c in rows[header_row_idx]]
+            header_index = build_header_index(headers)
             require_columns(headers, PPM_REQUIRED_COLUMNS, f"PPM file '{os.path.basename(ppm_path)}'")
 
-            col_po = get_col_index(headers, ["Purchase Order Number", "TC PO (85/58)"])
-            col_line = get_col_index(headers, ["PO Line Item Number", "PO LINE ITEM"])
-            col_size = get_col_index(headers, ["Size Description"])
+            col_po = get_col_index(header_index, ["Purchase Order Number", "TC PO (85/58)"])
+            col_line = get_col_index(header_index, ["PO Line Item Number", "PO LINE ITEM"])
+            col_size = get_col_index(header_index, ["Size Description"])
 
             # Costs
-            col_ag = get_col_index(headers, ["Surcharge Min Mat Main Body"])
-            col_ai = get_col_index(headers, ["Surcharge Min Material Trim"])
-            col_ak = get_col_index(headers, ["Surcharge Min Productivity"])
-            col_am = get_col_index(headers, ["Surcharge Misc"])
-            col_ao = get_col_index(headers, ["Surcharge VAS"])
-            col_aq = get_col_index(headers, ["Gross Price/FOB"])
+            col_ag = get_col_index(header_index, ["Surcharge Min Mat Main Body"])
+            col_ai = get_col_index(header_index, ["Surcharge Min Material Trim"])
+            col_ak = get_col_index(header_index, ["Surcharge Min Productivity"])
+            col_am = get_col_index(header_index, ["Surcharge Misc"])
+            col_ao = get_col_index(header_index, ["Surcharge VAS"])
+            col_aq = get_col_index(header_index, ["Gross Price/FOB"])
 
             if col_po == -1 or col_line == -1:
                 continue
@@ -939,14 +950,15 @@ def process_logic(master_files, ppm_files, pps_files, log_emit, report_emit, deb
             if not rows: continue
 
             headers = [str(c) for c in rows[0]]
+            header_index = build_header_index(headers)
             require_columns(headers, PPS_REQUIRED_COLUMNS, f"PPS file '{os.path.basename(pps_path)}'")
 
-            col_style = get_col_index(headers, ["STYLE"])
-            col_eff_date = get_col_index(headers, ["EFFECTIVE_DATE"])
-            col_season_year = get_col_index(headers, ["SEASON_YEAR", "SEASON YEAR"])
-            col_color = get_col_index(headers, ["COLOR"])
-            col_size_data = get_col_index(headers, ["SIZE_DATA"])
-            col_quote = get_col_index(headers, ["LOCAL_QUOTE_AMOUNT"])
+            col_style = get_col_index(header_index, ["STYLE"])
+            col_eff_date = get_col_index(header_index, ["EFFECTIVE_DATE"])
+            col_season_year = get_col_index(header_index, ["SEASON_YEAR", "SEASON YEAR"])
+            col_color = get_col_index(header_index, ["COLOR"])
+            col_size_data = get_col_index(header_index, ["SIZE_DATA"])
+            col_quote = get_col_index(header_index, ["LOCAL_QUOTE_AMOUNT"])
 
             if col_style == -1 or col_eff_date == -1:
                 continue
@@ -1025,30 +1037,31 @@ def process_logic(master_files, ppm_files, pps_files, log_emit, report_emit, deb
 
             header_idx = find_header_row_idx(rows_read)
             headers = [str(x) for x in rows_read[header_idx]]
+            header_index = build_header_index(headers)
             occc_required_columns = required_occc_columns_for_run(bool(ppm_files), bool(pps_files))
             require_columns(headers, occc_required_columns, f"OCCC master '{os.path.basename(occc_path)}'")
 
             # Map Columns
-            idx_nk_po = get_col_index(headers, ["NK SAP PO (45/35)", "NK SAP PO"])
-            idx_line = get_col_index(headers, ["PO LINE ITEM"])
-            idx_sc_min_prod = get_col_index(headers, ["S/C Min Production (ZPMX)"])
-            idx_sc_min_mat = get_col_index(headers, ["S/C Min Material (ZMMX)"])
-            idx_sc_min_mat_comment = get_col_index(headers, ["S/C Min Material (ZMMX) Comment"])
-            idx_sc_misc = get_col_index(headers, ["S/C Misc (ZMSX)"])
-            idx_sc_misc_comment = get_col_index(headers, ["S/C Misc (ZMSX) Comment"])
-            idx_sc_vas = get_col_index(headers, ["S/C VAS Manual (ZVAX)"])
-
-            idx_style = get_col_index(headers, ["STYLE"])
-            idx_buy_mth = get_col_index(headers, ["BUY MTH"])
-            idx_season = get_col_index(headers, ["SEASON"])
-            idx_season_year = get_col_index(headers, ["SEASON YEAR", "SEASON_YEAR"])
-            idx_cw = get_col_index(headers, ["CW"])
-
-            idx_ofob_reg = get_col_index(headers, ["OFOB (Regular sizes)"])
-            idx_ofob_ext = get_col_index(headers, ["OFOB (Extended sizes)"])
-            idx_final_reg = get_col_index(headers, ["FINAL FOB (Regular sizes)"])
-            idx_final_ext = get_col_index(headers, ["FINAL FOB (Extended sizes)", "FINAL FOB (Extended sizes) (2)"])
-            idx_ext_sizes_def = get_col_index(headers, [
+            idx_nk_po = get_col_index(header_index, ["NK SAP PO (45/35)", "NK SAP PO"])
+            idx_line = get_col_index(header_index, ["PO LINE ITEM"])
+            idx_sc_min_prod = get_col_index(header_index, ["S/C Min Production (ZPMX)"])
+            idx_sc_min_mat = get_col_index(header_index, ["S/C Min Material (ZMMX)"])
+            idx_sc_min_mat_comment = get_col_index(header_index, ["S/C Min Material (ZMMX) Comment"])
+            idx_sc_misc = get_col_index(header_index, ["S/C Misc (ZMSX)"])
+            idx_sc_misc_comment = get_col_index(header_index, ["S/C Misc (ZMSX) Comment"])
+            idx_sc_vas = get_col_index(header_index, ["S/C VAS Manual (ZVAX)"])
+
+            idx_style = get_col_index(header_index, ["STYLE"])
+            idx_buy_mth = get_col_index(header_index, ["BUY MTH"])
+            idx_season = get_col_index(header_index, ["SEASON"])
+            idx_season_year = get_col_index(header_index, ["SEASON YEAR", "SEASON_YEAR"])
+            idx_cw = get_col_index(header_index, ["CW"])
+
+            idx_ofob_reg = get_col_index(header_index, ["OFOB (Regular sizes)"])
+            idx_ofob_ext = get_col_index(header_index, ["OFOB (Extended sizes)"])
+            idx_final_reg = get_col_index(header_index, ["FINAL FOB (Regular sizes)"])
+            idx_final_ext = get_col_index(header_index, ["FINAL FOB (Extended sizes)", "FINAL FOB (Extended sizes) (2)"])
+            idx_ext_sizes_def = get_col_index(header_index, [
                 "Extended Sizes",
                 "Extended Sizes (2)",
                 "EXT SIZE",
@@ -1056,16 +1069,20 @@ def process_logic(master_files, ppm_files, pps_files, log_emit, report_emit, deb
                 "EXTENDED SIZE",
             ])
 
-            idx_remarks = get_col_index(headers, ["PRICE DIFF REMARKS"])
-            idx_dpom_fob = get_col_index(headers, ["DPOM - Incorrect FOB"])
+            idx_remarks = get_col_index(header_index, ["PRICE DIFF REMARKS"])
+            idx_dpom_fob = get_col_index(header_index, ["DPOM - Incorrect FOB"])
 
             # Init Header for Remarks
             if idx_remarks == -1:
                 # Put it at the end when missing
                 insert_pos = len(headers)
                 if is_excel:
-                    ws_write.insert_cols(insert_pos + 1)
+                    # When DPOM - Incorrect FOB is missing too, open both columns in one shift
+                    add_dpom_fob = idx_dpom_fob == -1
+                    ws_write.insert_cols(insert_pos + 1, amount=2 if add_dpom_fob else 1)
                     ws_write.cell(row=header_idx+1, column=insert_pos+1).value = "PRICE DIFF REMARKS"
+                    if add_dpom_fob:
+                        ws_write.cell(row=header_idx+1, column=insert_pos+2).value = "DPOM - Incorrect FOB"
                     idx_remarks = insert_pos
                 else:
                     output_csv_data[header_idx].append("PRICE DIFF REMARKS")
@@ -4,6 +4,7 @@ from __future__ import annotations
 import re
 import threading
 import math
+import traceback
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
@@ -1962,7 +1963,6 @@ class MainWidget(QWidget):
             except Exception as e:
                 self._last_error = e
                 self.log_message.emit(f"CRITICAL ERROR: {e}")
-                import traceback
                 self.log_message.emit(traceback.format_exc())
                 self.processing_done.emit("", "")
 
@@ -25,6 +25,7 @@ import os
 import re
 import threading
 import time
+import traceback
 from copy import copy
 from datetime import date, datetime
 from typing import Dict, List, Any, Optional, Tuple
@@ -148,6 +149,55 @@ def _row_has_any_values(row: tuple) -> bool:
     return any(_has_meaningful_value(v) for v in row)
 
 
+def _fill_rgb(cell) -> str:
+    """Upper-cased start colour of a cell's fill ('' when it has none)."""
+    try:
+        return str(getattr(getattr(cell.fill, "start_color", None), "rgb", "") or "").upper()
+    except Exception:
+        return ""
+
+
+def _cached_fill_rgb(cell, cache: Dict[int, str]) -> str:
+    """_fill_rgb looked up by the cell's fill id; a sheet only uses a handful of fills."""
+    style = cell._style
+    fill_id = style.fillId if style is not None else 0
+    rgb = cache.get(fill_id)
+    if rgb is None:
+        rgb = cache[fill_id] = _fill_rgb(cell)
+    return rgb
+
+
+def _delete_row_ranges(ws, ranges: List[Tuple[int, int]]) -> None:
+    """Delete several (start_row, end_row) blocks with a single pass over the cells.
+
+    Calling ws.delete_rows per block shifts every cell below it each time; here each
+    surviving cell moves once, by the number of deleted rows above it.
+    """
+    spans: List[List[int]] = []
+    for start_row, end_row in sorted(ranges):
+        if spans and start_row <= spans[-1][1] + 1:
+            spans[-1][1] = max(spans[-1][1], end_row)
+        else:
+            spans.append([start_row, end_row])
+    if not spans:
+        return
+
+    kept = {}
+    span_idx = 0
+    deleted_above = 0
+    for row, col in sorted(ws._cells):
+        while span_idx < len(spans) and row > spans[span_idx][1]:
+            deleted_above += spans[span_idx][1] - spans[span_idx][0] + 1
+            span_idx += 1
+        if span_idx < len(spans) and row >= spans[span_idx][0]:
+            continue
+        cell = ws._cells[row, col]
+        cell.row = row - deleted_above
+        kept[cell.row, col] = cell
+    ws._cells = kept
+    ws._current_row = ws.max_row if kept else 0
+
+
 def _ensure_unique_path(path: str) -> str:
     """Append (n) to path if needed to avoid overwriting existing files."""
     if not os.path.exists(path):
@@ -529,6 +579,9 @@ class VTECProcessor:
             ws = wb["VTEC Monitoring Chart"]
             self.log("Updating existing 'VTEC Monitoring Chart' sheet")
 
+        # Fill colour per fill id for the highlight checks below
+        fill_rgbs: Dict[int, str] = {}
+
         # Track existing groups and their row ranges
         existing_groups = {}  # group -> {'header': row, 'first_job': row, 'last_job': row, 'debit': row, 'charge': row, 'exch': row, 'total': row}
         existing_pi_rows = {}  # pi_full -> row
@@ -578,12 +631,8 @@ class VTECProcessor:
                     last_progress = now
                 for col in range(1, 12):
                     cell = ws.cell(row=row, column=col)
-                    try:
-                        rgb = str(getattr(getattr(cell.fill, "start_color", None), "rgb", "") or "").upper()
-                        if rgb.endswith("C6EFCE"):
-                            cell.fill = NO_FILL
-                    except Exception:
-                        pass
+                    if _cached_fill_rgb(cell, fill_rgbs).endswith("C6EFCE"):
+                        cell.fill = NO_FILL
 
             self.log(f"Cleared green highlights in {time.perf_counter() - clear_t0:.1f}s")
 
@@ -719,11 +768,8 @@ class VTECProcessor:
                     src = ws.cell(row=4, column=col)
                     dst = dup_ws.cell(row=2, column=col)
                     dst.value = src.value
-                    dst.fill = copy(src.fill)
-                    dst.font = copy(src.font)
-                    dst.border = copy(src.border)
-                    dst.alignment = copy(src.alignment)
-                    dst.number_format = src.number_format
+                    # Same workbook: share the source style ids instead of cloning each style object
+                    dst._style = copy(src._style)
 
                 paste_row = 3
                 ranges_to_delete: list[tuple[int, int]] = []
@@ -751,19 +797,13 @@ class VTECProcessor:
                                 src_cell = ws.cell(row=src_r, column=col)
                                 dst_cell = dup_ws.cell(row=paste_row + (src_r - start_row), column=col)
                                 dst_cell.value = src_cell.value
-                                dst_cell.fill = copy(src_cell.fill)
-                                dst_cell.font = copy(src_cell.font)
-                                dst_cell.border = copy(src_cell.border)
-                                dst_cell.alignment = copy(src_cell.alignment)
-                                dst_cell.number_format = src_cell.number_format
+                                dst_cell._style = copy(src_cell._style)
                         paste_row += (end_row - start_row + 1) + 1
 
                         ranges_to_delete.append((start_row, end_row))
 
-                # Delete from monitoring sheet (reverse order to avoid row shift issues)
-                ranges_to_delete.sort(reverse=True, key=lambda x: x[0])
-                for start_row, end_row in ranges_to_delete:
-                    ws.delete_rows(start_row, end_row - start_row + 1)
+                # Delete from monitoring sheet
+                _delete_row_ranges(ws, ranges_to_delete)
 
                 for col in range(1, 12):
                     dup_ws.column_dimensions[get_column_letter(col)].auto_size = True
@@ -1044,7 +1084,7 @@ class VTECProcessor:
                     for col in range(1, 12):
                         cell = ws.cell(row=row, column=col)
                         # Preserve yellow if present
-                        if cell.fill.start_color.rgb != "00FFFF00" and cell.fill.start_color.rgb != "FFFF00":
+                        if _cached_fill_rgb(cell, fill_rgbs) not in ("00FFFF00", "FFFF00"):
                             cell.fill = GREEN_FILL
 
                 group_ranges[group] = (header_row, first_job_row, last_job_row, debit_row, total_row)
@@ -1189,8 +1229,10 @@ class VTECProcessor:
                     if job_val:
                         existing_jobs_by_pi[pi_full_val].add(job_val)
 
-                # Insert missing rows for new PI entries / new jobs
+                # Insert missing rows for new PI entries / new jobs.
+                # Collect them first so the block below is shifted by one insert_rows call.
                 insert_pos = debit_row or charge_row or exch_row or total_row or (last_job_row + 1)
+                new_rows = []
                 for pi_key in pi_keys:
                     if pi_key not in self.dict_pi:
                         continue
@@ -1200,82 +1242,64 @@ class VTECProcessor:
                         for job_no, pay_data in self.dict_payment[prefix].items():
                             if job_no in existing_jobs_by_pi.get(pi_full, set()):
                                 continue
-                            pay_amt, inv_date, inv_qty = pay_data
-
-                            ws.insert_rows(insert_pos)
-                            inserted_rows += 1
-
-                            ws.cell(row=insert_pos, column=1).value = group
-                            ws.cell(row=insert_pos, column=2).value = job_no
-                            ws.cell(row=insert_pos, column=3).value = pi_full
-                            ws.cell(row=insert_pos, column=4).value = pi_month
-                            date_cell = ws.cell(row=insert_pos, column=5)
-                            date_cell.value = inv_date
-                            date_cell.number_format = INVOICE_DATE_NUMBER_FORMAT
-                            ws.cell(row=insert_pos, column=6).value = pi_qty
-                            ws.cell(row=insert_pos, column=6).number_format = "#,##0"
-                            ws.cell(row=insert_pos, column=8).value = inv_qty
-                            ws.cell(row=insert_pos, column=8).number_format = "#,##0"
-                            ws.cell(row=insert_pos, column=9).value = round(pay_amt, 2)
-                            ws.cell(row=insert_pos, column=9).number_format = "#,##0.00"
-
-                            rows_to_highlight.add(insert_pos)
-                            group_changed_rows += 1
+                            new_rows.append((job_no, pi_full, pi_month, pi_qty, pay_data))
                             existing_pi_fulls.add(pi_full)
                             if pi_full not in existing_jobs_by_pi:
                                 existing_jobs_by_pi[pi_full] = set()
                             existing_jobs_by_pi[pi_full].add(job_no)
-
-                            insert_pos += 1
-                            last_job_row += 1
-                            if debit_row:
-                                debit_row += 1
-                            if charge_row:
-                                charge_row += 1
-                            if exch_row:
-                                exch_row += 1
-                            total_row += 1
                     else:
                         if pi_full in existing_pi_fulls:
                             continue
+                        new_rows.append((self.dict_pi_job_nos.get(pi_key, ""), pi_full, pi_month, pi_qty, None))
+                        existing_pi_fulls.add(pi_full)
 
-                        pi_job_no = self.dict_pi_job_nos.get(pi_key, "")
-                        ws.insert_rows(insert_pos)
-                        inserted_rows += 1
-
-                        ws.cell(row=insert_pos, column=1).value = group
-                        ws.cell(row=insert_pos, column=2).value = pi_job_no
-                        ws.cell(row=insert_pos, column=3).value = pi_full
-                        ws.cell(row=insert_pos, column=4).value = pi_month
-                        ws.cell(row=insert_pos, column=6).value = pi_qty
-                        ws.cell(row=insert_pos, column=6).number_format = "#,##0"
-                        ws.cell(row=insert_pos, column=6).fill = YELLOW_FILL
-
-                        rows_to_highlight.add(insert_pos)
+                # A missing debit row (when there is debit data) goes right after the new job
+                # rows, so it shares their insert_rows shift.
+                add_debit_row = group in self.dict_debit and debit_row is None and bool(charge_row or exch_row or total_row)
+                added = len(new_rows)
+                if added or add_debit_row:
+                    ws.insert_rows(insert_pos, amount=added + add_debit_row)
+                    inserted_rows += added + add_debit_row
+
+                if new_rows:
+                    for offset, (job_no, pi_full, pi_month, pi_qty, pay_data) in enumerate(new_rows):
+                        row = insert_pos + offset
+                        ws.cell(row=row, column=1).value = group
+                        ws.cell(row=row, column=2).value = job_no
+                        ws.cell(row=row, column=3).value = pi_full
+                        ws.cell(row=row, column=4).value = pi_month
+                        ws.cell(row=row, column=6).value = pi_qty
+                        ws.cell(row=row, column=6).number_format = "#,##0"
+                        if pay_data is not None:
+                            pay_amt, inv_date, inv_qty = pay_data
+                            date_cell = ws.cell(row=row, column=5)
+                            date_cell.value = inv_date
+                            date_cell.number_format = INVOICE_DATE_NUMBER_FORMAT
+                            ws.cell(row=row, column=8).value = inv_qty
+                            ws.cell(row=row, column=8).number_format = "#,##0"
+                            ws.cell(row=row, column=9).value = round(pay_amt, 2)
+                            ws.cell(row=row, column=9).number_format = "#,##0.00"
+                        else:
+                            ws.cell(row=row, column=6).fill = YELLOW_FILL
+
+                        rows_to_highlight.add(row)
                         group_changed_rows += 1
-                        existing_pi_fulls.add(pi_full)
-                        insert_pos += 1
-                        last_job_row += 1
-                        if debit_row:
-                            debit_row += 1
-                        if charge_row:
-                            charge_row += 1
-                        if exch_row:
-                            exch_row += 1
-                        total_row += 1
-
-                # Ensure a debit row exists if we have debit data but no debit row in the sheet
-                if group in self.dict_debit and debit_row is None:
-                    debit_insert_pos = charge_row or exch_row or total_row
-                    if debit_insert_pos:
-                        ws.insert_rows(debit_insert_pos)
-                        inserted_rows += 1
-                        debit_row = debit_insert_pos
-                        if charge_row:
-                            charge_row += 1
-                        if exch_row:
-                            exch_row += 1
-                        total_row += 1
+
+                    insert_pos += added
+                    last_job_row += added
+                    if debit_row:
+                        debit_row += added
+
+                if add_debit_row:
+                    debit_row = insert_pos
+                    added += 1
+
+                if added:
+                    if charge_row:
+                        charge_row += added
+                    if exch_row:
+                        exch_row += added
+                    total_row += added
 
                 # Update debit note row if changed
                 if group in self.dict_debit and debit_row:
@@ -1374,11 +1398,7 @@ class VTECProcessor:
                 needs_attention = (not prefix) or (prefix not in self.dict_payment) or (prefix in self.dict_duplicate_prefixes)
 
                 qty_cell = ws.cell(row=r, column=6)
-                try:
-                    rgb = str(getattr(getattr(qty_cell.fill, "start_color", None), "rgb", "") or "").upper()
-                    is_yellow = rgb.endswith("FFFF00")
-                except Exception:
-                    is_yellow = False
+                is_yellow = _cached_fill_rgb(qty_cell, fill_rgbs).endswith("FFFF00")
 
                 if needs_attention:
                     qty_cell.fill = YELLOW_FILL
@@ -1400,12 +1420,8 @@ class VTECProcessor:
             for col in range(1, 12):
                 cell = ws.cell(row=row, column=col)
                 # Don't override yellow
-                try:
-                    rgb = str(getattr(getattr(cell.fill, "start_color", None), "rgb", "") or "").upper()
-                    if rgb.endswith("FFFF00"):
-                        continue
-                except Exception:
-                    pass
+                if _cached_fill_rgb(cell, fill_rgbs).endswith("FFFF00"):
+                    continue
                 cell.fill = GREEN_FILL
         self.log(f"Green highlights applied in {time.perf_counter() - green_t0:.1f}s")
 
@@ -1504,21 +1520,15 @@ class VTECProcessor:
                                 return f"{m.group(1)}{int(m.group(2)) + row_delta}"
                             value = re.sub(r"(\$?[A-Z]{1,3}\$?)(\d+)", _shift_ref, value)
                         dst_cell.value = value
-                        dst_cell.fill = copy(src_cell.fill)
-                        dst_cell.font = copy(src_cell.font)
-                        dst_cell.border = copy(src_cell.border)
-                        dst_cell.alignment = copy(src_cell.alignment)
-                        dst_cell.number_format = src_cell.number_format
+                        dst_cell._style = copy(src_cell._style)
                     paste_row += 1
                 paste_row += 1  # Spacing
 
                 ranges_to_delete.append((header_row, total_row))
                 moved_groups += 1
 
-        # Delete from monitor sheet (in reverse order to avoid index issues)
-        ranges_to_delete.sort(reverse=True, key=lambda x: x[0])
-        for start_row, end_row in ranges_to_delete:
-            monitor_ws.delete_rows(start_row, end_row - start_row + 1)
+        # Delete from monitor sheet
+        _delete_row_ranges(monitor_ws, ranges_to_delete)
 
         self.log(f"  Moved {moved_groups:,} group(s) to 'Zero Balance Groups'")
 
@@ -1539,6 +1549,9 @@ class VTECProcessor:
         last_data_row = self._find_last_data_row(ws, start_row=4, max_col=MONITOR_DATA_MAX_COL)
         last_row = max(last_data_row + 1, 4)  # allow one blank row after last data row
 
+        # Collect the surplus blank rows first and delete each run in one call,
+        # so the rows below shift once per run instead of once per row.
+        delete_runs = []  # (top_row, count), bottom-up
         blank_count = 0
         for row in range(last_row, 4, -1):
             is_blank = True
@@ -1550,10 +1563,16 @@ class VTECProcessor:
             if is_blank:
                 blank_count += 1
                 if blank_count > 1:
-                    ws.delete_rows(row)
+                    if delete_runs and delete_runs[-1][0] == row + 1:
+                        delete_runs[-1] = (row, delete_runs[-1][1] + 1)
+                    else:
+                        delete_runs.append((row, 1))
             else:
                 blank_count = 0
 
+        for top_row, count in delete_runs:
+            ws.delete_rows(top_row, count)
+
 
 def run_process(payment_path: str, pi_path: str, debit_path: str, charge_path: str,
                 monitor_path: Optional[str], log_emit) -> Tuple[str, bool]:
@@ -1633,7 +1652,6 @@ def run_process(payment_path: str, pi_path: str, debit_path: str, charge_path: s
 
     except Exception as e:
         log_emit(f"ERROR: {e}")
-        import traceback
         log_emit(traceback.format_exc())
         return "", False
 
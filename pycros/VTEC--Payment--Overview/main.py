@@ -1120,16 +1120,21 @@ def set_column_number_format(ws, col_idx: int, number_format: str):
 
 
 def auto_fit_columns(ws, min_col: int, max_col: int, max_row: int):
-    for col_idx in range(min_col, max_col + 1):
-        max_len = 0
-        for row in range(1, max_row + 1):
-            value = ws.cell(row=row, column=col_idx).value
-            if value is None:
-                continue
-            length = max(len(part) for part in str(value).splitlines()) if str(value).splitlines() else 0
-            max_len = max(max_len, length)
+    # One row-major pass over the block; widths[i] tracks column min_col + i
+    widths = [0] * (max_col - min_col + 1)
+    if max_row >= 1:
+        for row in ws.iter_rows(min_row=1, max_row=max_row, min_col=min_col, max_col=max_col, values_only=True):
+            for i, value in enumerate(row):
+                if value is None:
+                    continue
+                lines = str(value).splitlines()
+                if lines:
+                    length = max(len(part) for part in lines)
+                    if length > widths[i]:
+                        widths[i] = length
+    for i, max_len in enumerate(widths):
         width = min(max(max_len + 2, 8), 60)
-        ws.column_dimensions[get_column_letter(col_idx)].width = width
+        ws.column_dimensions[get_column_letter(min_col + i)].width = width
 
 
 def autofit_log_sheet(log_ws):
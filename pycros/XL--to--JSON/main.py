@@ -1,6 +1,7 @@
 import os
 import json
 import threading
+import traceback
 from datetime import datetime
 from pathlib import Path
 from typing import List
@@ -239,7 +240,6 @@ def excel_to_detailed_json(file_path, output_json_path, log_emit):
         return True
 
     except Exception as e:
-        import traceback
         traceback.print_exc() # Print full error to console for debugging
         log_emit(f"Error processing {os.path.basename(file_path)}: {e}")
         return False